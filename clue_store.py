@@ -0,0 +1,217 @@
+"""
+clue_store.py — Low-memory corpus backend for the Jeopardy Trainer.
+Call open_clue_store() instead of loading a DataFrame on small instances
+(set TRIVIA_CORPUS_BACKEND=mmap for the main app).
+
+How it works:
+  Each season TSV is memory-mapped and never materialized. A compact index
+  holds, for every usable row, its file, its byte offset, its clue id, its
+  study tag and the three small columns filtering needs (clue_value, round,
+  season). A full row is decoded and cleaned (clue_stream.clean_text) on demand when
+  the app shows a clue.
+  Tags are computed once by the tag engine while the index is built and
+  stored as int8 codes into the taxonomy's tag list (tagged across a process
+  pool on multi-core machines), which the manifest keeps alongside the
+  rules' fingerprint; the index is rebuilt when the fingerprint changes.
+  The index (~8 MB for 160k rows) is persisted to
+  .corpus_cache/clue_store.npz and rebuilt only when a season file's name,
+  size or mtime changes — the same key as the Parquet cache.
+
+  Compressed season files cannot be memory-mapped, so they are inflated once
+  into .corpus_cache/inflated/ (refreshed when the source is newer) and the
+  inflated copy is mapped instead — a disk-for-RAM trade on small instances.
+
+  Rows are dropped with the same rule as corpus.load_corpus: no answer or no
+  question, where pandas' default NA strings ("NA", "null", …) count as missing.
+"""
+
+import json
+import mmap
+import os
+import shutil
+
+import numpy as np
+
+from clue_stream import (
+    NA_STRINGS, SEASON_SUFFIXES, clean_text, clue_id, is_compressed,
+    open_season_binary, season_files, season_label, select_seasons, to_int,
+)
+from corpus import CACHE_DIRNAME, file_fingerprint
+from tag_engine import pinned_taxonomy, tag_clues_parallel, taxonomy
+
+STORE_VERSION = 4
+INT_COLUMNS = ("round", "clue_value", "daily_double_value")
+
+class ClueStore:
+    """
+    Read-only clue corpus over memory-mapped season files.
+
+      len(store)            → number of clues
+      store["clue_value"]   → numpy column (clue_value, round, season only)
+      store.row(i)          → {column: value} for clue i, decoded on demand
+      store.clue_ids()      → every clue's id, straight from the index
+    """
+
+    def __init__(self, files: list, header: list, index: dict, tags: list):
+        self.files   = files
+        self.header  = header
+        self.tags    = tags          # tag code → label, as the index was built
+        self.columns = header + ["season", "clue_id"]
+        self._index  = index
+        self._labels = [season_label(f) for f in files]
+        self._maps   = []
+        for f in files:
+            with open(f, "rb") as fh:
+                self._maps.append(mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self) -> int:
+        return len(self._index["offset"])
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        if column not in ("clue_value", "round", "season"):
+            raise KeyError(f"{column!r} is not an indexed column; use row()")
+        return self._index[column]
+
+    def row(self, i: int) -> dict:
+        """Decode clue i from its season file."""
+        mm    = self._maps[self._index["file_no"][i]]
+        start = int(self._index["offset"][i])
+        end   = mm.find(b"\n", start)
+        line  = mm[start:end if end != -1 else len(mm)].decode("utf-8").rstrip("\r")
+        raw   = dict(zip(self.header, line.split("\t")))
+        out   = {}
+        for col, val in raw.items():
+            if col in INT_COLUMNS:
+                out[col] = to_int(val) if val not in NA_STRINGS else 0
+            else:
+                out[col] = None if val in NA_STRINGS else clean_text(val)
+        out["season"]  = self._labels[self._index["file_no"][i]]
+        out["clue_id"] = self._index["clue_id"][i].decode()
+        out["tag"]     = self.tags[self._index["tag"][i]]
+        return out
+
+    def clue_ids(self, start: int = 0) -> list:
+        """Precomputed clue ids from row start on, without decoding rows."""
+        return [b.decode() for b in self._index["clue_id"][start:]]
+
+    def close(self):
+        for mm in self._maps:
+            mm.close()
+
+# ─── Index build / persistence ────────────────────────────────────────────────
+
+def _build_index(files: list, all_tags: list) -> tuple[list, dict]:
+    """Scan every file once, recording row offsets and the filter columns."""
+    header = None
+    offsets, file_ids, values, rounds, seasons, ids = [], [], [], [], [], []
+    categories, answers = [], []
+    for file_no, path in enumerate(files):
+        label = season_label(path)
+        season_num = int(label) if label.isdigit() else -1
+        with open(path, "rb") as fh:
+            data = fh.read()
+        pos = data.find(b"\n") + 1
+        file_header = data[:pos].decode("utf-8").rstrip("\r\n").split("\t")
+        header = header or file_header
+        col = {name: j for j, name in enumerate(file_header)}
+        while pos < len(data):
+            end = data.find(b"\n", pos)
+            if end == -1:
+                end = len(data)
+            fields = data[pos:end].decode("utf-8").rstrip("\r").split("\t")
+            if len(fields) == len(file_header) and \
+               fields[col["answer"]] not in NA_STRINGS and \
+               fields[col["question"]] not in NA_STRINGS:
+                offsets.append(pos)
+                file_ids.append(file_no)
+                values.append(to_int(fields[col["clue_value"]]))
+                rounds.append(to_int(fields[col["round"]]))
+                seasons.append(season_num)
+                ids.append(clue_id(fields[col["category"]], fields[col["answer"]], fields[col["question"]]))
+                category = fields[col["category"]]
+                categories.append(float("nan") if category in NA_STRINGS else clean_text(category))
+                answers.append(clean_text(fields[col["answer"]]))
+            pos = end + 1
+    tag_code = {tag: code for code, tag in enumerate(all_tags)}
+    tags = [tag_code[t] for t in tag_clues_parallel(categories, answers)]
+    index = {
+        "offset":     np.asarray(offsets,  dtype=np.int64),
+        "file_no":    np.asarray(file_ids, dtype=np.uint16),
+        "clue_value": np.asarray(values,   dtype=np.int32),
+        "round":      np.asarray(rounds,   dtype=np.int8),
+        "season":     np.asarray(seasons,  dtype=np.int16),
+        "clue_id":    np.asarray(ids,      dtype="S32"),
+        "tag":        np.asarray(tags,     dtype=np.int8),
+    }
+    return header or [], index
+
+def _mappable(data_dir: str, path: str) -> str:
+    """path itself if plain, else an inflated copy under the cache folder."""
+    if not is_compressed(path):
+        return path
+    name = os.path.basename(path)
+    for suffix in SEASON_SUFFIXES[1:]:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)] + SEASON_SUFFIXES[0]
+    target = os.path.join(data_dir, CACHE_DIRNAME, "inflated", name)
+    if not os.path.exists(target) or os.path.getmtime(target) < os.path.getmtime(path):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open_season_binary(path) as src, open(target + ".tmp", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(target + ".tmp", target)
+    return target
+
+def _store_paths(data_dir: str) -> tuple[str, str]:
+    cache_dir = os.path.join(data_dir, CACHE_DIRNAME)
+    return os.path.join(cache_dir, "clue_store.npz"), os.path.join(cache_dir, "clue_store.json")
+
+def _select(files: list, index: dict, seasons=None, rounds=None) -> dict:
+    """Index restricted to the selected seasons/rounds (the persisted index stays whole)."""
+    if seasons is None and rounds is None:
+        return index
+    mask = np.ones(len(index["offset"]), dtype=bool)
+    if seasons is not None:
+        keep = set(select_seasons(files, seasons))
+        mask &= np.isin(index["file_no"], [n for n, f in enumerate(files) if f in keep])
+    if rounds is not None:
+        mask &= np.isin(index["round"], [int(r) for r in rounds])
+    return {k: v[mask] for k, v in index.items()}
+
+def open_clue_store(data_dir: str = ".", seasons=None, rounds=None):
+    """
+    Open the memory-mapped store, (re)building its index if stale. None if
+    no files. seasons / rounds restrict the clues exposed, as in load_corpus.
+    """
+    files = season_files(data_dir)
+    if not files:
+        return None
+    fingerprint = file_fingerprint(files)
+    index_path, manifest_path = _store_paths(data_dir)
+    files = [_mappable(data_dir, f) for f in files]
+
+    try:
+        with open(manifest_path) as fh:
+            manifest = json.load(fh)
+        if manifest.get("version") == STORE_VERSION and manifest.get("files") == fingerprint \
+           and manifest.get("tag_rules") == taxonomy().fingerprint:
+            with np.load(index_path) as npz:
+                index = {k: npz[k] for k in npz.files}
+            return ClueStore(files, manifest["header"], _select(files, index, seasons, rounds),
+                             manifest["tags"])
+    except Exception:
+        pass
+
+    with pinned_taxonomy() as tax:
+        header, index = _build_index(files, tax.all_tags)
+    try:
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        with open(index_path + ".tmp", "wb") as fh:
+            np.savez(fh, **index)
+        os.replace(index_path + ".tmp", index_path)
+        with open(manifest_path + ".tmp", "w") as fh:
+            json.dump({"version": STORE_VERSION, "files": fingerprint, "header": header,
+                       "tag_rules": tax.fingerprint, "tags": tax.all_tags}, fh, indent=1)
+        os.replace(manifest_path + ".tmp", manifest_path)
+    except Exception:
+        pass
+    return ClueStore(files, header, _select(files, index, seasons, rounds), tax.all_tags)
@@ -0,0 +1,221 @@
+"""
+clue_stream.py — Streaming access to the season files for offline tools.
+Standard library only: no Streamlit, no pandas, constant memory.
+
+    from clue_stream import iter_clues, iter_clue_batches
+
+    for clue in iter_clues(seasons=[40, 41], rounds=[3]):
+        print(clue.category, clue.answer)
+
+    for batch in iter_clue_batches(1000, min_value=1600):
+        ...
+
+Each clue is a typed Clue record (a NamedTuple; clue._asdict() gives the
+dict shape the tag engine expects). Rows without an answer or question are
+skipped with the same rule load_corpus() uses, so counts match the app.
+Files are read one line at a time and filtered seasons are never opened.
+
+Cleaning:
+  clean_text() is the single text-cleaning rule for every reader: it drops
+  the backslash escapes the TSVs carry (\\" → "), strips markup tags and
+  decodes HTML entities. clue_id() fingerprints a clue from its *raw* text,
+  so ids stay stable for tag overrides saved before cleaning existed.
+
+Compressed seasons:
+  season files may be stored as seasonNN.tsv, seasonNN.tsv.gz or
+  seasonNN.tsv.zst; open_season() decompresses as a stream while reading.
+  .zst needs the optional zstandard package. If one season exists in more
+  than one form, the plain .tsv wins, so no season is ever loaded twice.
+
+Also runnable: `python clue_stream.py --season 41 --round 3` writes matching
+clues to stdout as JSON lines.
+"""
+
+import csv
+import glob
+import hashlib
+import gzip
+import html
+import io
+import os
+import re
+from datetime import date
+from typing import Iterator, NamedTuple, Optional
+
+# plain first: when a season exists in several forms the earliest suffix wins
+SEASON_SUFFIXES = (".tsv", ".tsv.gz", ".tsv.zst")
+
+# pandas' default na_values, so the DataFrame loaders and the streaming /
+# memory-mapped readers all treat the same cells as missing
+NA_STRINGS = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+}
+
+class Clue(NamedTuple):
+    round:              int
+    clue_value:         int
+    daily_double_value: int
+    category:           Optional[str]
+    comments:           Optional[str]
+    answer:             str
+    question:           str
+    air_date:           Optional[date]
+    notes:              Optional[str]
+    season:             str
+    clue_id:            str
+
+# ─── Season files ─────────────────────────────────────────────────────────────
+
+def season_label(path: str) -> str:
+    """'season37.tsv' → '37'. Files without a number are labelled '??'."""
+    s_match = re.search(r'\d+', os.path.basename(path))
+    return s_match.group() if s_match else "??"
+
+def season_files(data_dir: str = ".") -> list:
+    """
+    All season files in data_dir, one per season (plain .tsv preferred over
+    .tsv.gz over .tsv.zst), in season-number order (season9 before season10).
+    """
+    by_stem = {}
+    for suffix in SEASON_SUFFIXES:
+        for path in glob.glob(os.path.join(data_dir, "*" + suffix)):
+            by_stem.setdefault(os.path.basename(path)[:-len(suffix)], path)
+
+    def _key(path):
+        label = season_label(path)
+        return (int(label) if label.isdigit() else float("inf"), path)
+    return sorted(by_stem.values(), key=_key)
+
+def select_seasons(files: list, seasons=None) -> list:
+    """Keep only files whose season number (or label) is in seasons; None keeps all."""
+    if seasons is None:
+        return files
+    keep = {str(s) for s in seasons}
+    return [f for f in files if season_label(f) in keep]
+
+def is_compressed(path: str) -> bool:
+    return path.endswith((".gz", ".zst"))
+
+def open_season_binary(path: str):
+    """Binary stream over a season file's TSV bytes, decompressing on the fly."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(f"reading {os.path.basename(path)} needs the zstandard package")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb")
+
+def open_season(path: str):
+    """Text stream (utf-8, newlines untranslated for csv) over a season file."""
+    return io.TextIOWrapper(open_season_binary(path), encoding="utf-8", newline="")
+
+# ─── Field decoding ───────────────────────────────────────────────────────────
+
+_ESCAPE_RE    = re.compile(r'\\(["\'\\])')        # \" \' \\  → the bare character
+_TAG_RE       = re.compile(r'</?[a-zA-Z][^<>]*>')  # <i>, </a>, <br/> …
+CLEAN_TRIGGER = r'[\\<&]'                          # cells without these need no cleaning
+
+def clean_text(text):
+    """Unescape, strip markup and decode entities. None/NA passes through."""
+    if not isinstance(text, str) or not text:
+        return text
+    text = _ESCAPE_RE.sub(r'\1', text)
+    text = _TAG_RE.sub('', text)
+    return html.unescape(text) if '&' in text else text
+
+def clue_id(category, answer, question) -> str:
+    """Stable fingerprint for a clue: sha256 of its raw category+answer+question."""
+    raw = f"{category}{answer}{question}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+def to_int(text: str) -> int:
+    """'$1,200' / '1200.0' / '' → int, with anything unparseable → 0."""
+    try:
+        return int(float(text.replace(",", "").replace("$", "")))
+    except ValueError:
+        return 0
+
+def _to_date(text: str):
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        return None
+
+def _text(text: str):
+    return None if text in NA_STRINGS else clean_text(text)
+
+def _make_clue(record: dict, season: str) -> Clue:
+    return Clue(
+        round=              to_int(record.get("round", "")),
+        clue_value=         to_int(record.get("clue_value", "")),
+        daily_double_value= to_int(record.get("daily_double_value", "")),
+        category=           _text(record.get("category", "")),
+        comments=           _text(record.get("comments", "")),
+        answer=             clean_text(record["answer"]),
+        question=           clean_text(record["question"]),
+        air_date=           _to_date(record.get("air_date", "")),
+        notes=              _text(record.get("notes", "")),
+        season=             season,
+        clue_id=            clue_id(record.get("category", ""), record["answer"], record["question"]),
+    )
+
+# ─── Public API ───────────────────────────────────────────────────────────────
+
+def iter_clues(data_dir: str = ".", seasons=None, rounds=None,
+               min_value: int = None, max_value: int = None) -> Iterator[Clue]:
+    """
+    Yield clues one at a time in (season, air_date) order.
+    seasons / rounds: iterables of season numbers (or labels) / round numbers
+    to keep; min_value / max_value bound clue_value inclusively.
+    """
+    keep_rounds = {int(r) for r in rounds} if rounds is not None else None
+
+    for path in select_seasons(season_files(data_dir), seasons):
+        season = season_label(path)
+        with open_season(path) as fh:
+            for record in csv.DictReader(fh, delimiter="\t"):
+                if record.get("answer") in NA_STRINGS or record.get("question") in NA_STRINGS:
+                    continue
+                clue = _make_clue(record, season)
+                if keep_rounds is not None and clue.round not in keep_rounds:
+                    continue
+                if min_value is not None and clue.clue_value < min_value:
+                    continue
+                if max_value is not None and clue.clue_value > max_value:
+                    continue
+                yield clue
+
+def iter_clue_batches(batch_size: int = 1000, data_dir: str = ".", **filters) -> Iterator[list]:
+    """iter_clues() grouped into lists of batch_size (the last may be shorter)."""
+    batch = []
+    for clue in iter_clues(data_dir, **filters):
+        batch.append(clue)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import sys
+
+    parser = argparse.ArgumentParser(description="Stream clues from the season files as JSON lines.")
+    parser.add_argument("--data-dir", default=".", help="folder holding the season TSVs")
+    parser.add_argument("--season", type=int, action="append", help="season number (repeatable)")
+    parser.add_argument("--round", type=int, action="append", help="round number (repeatable)")
+    parser.add_argument("--min-value", type=int, default=None)
+    parser.add_argument("--max-value", type=int, default=None)
+    args = parser.parse_args()
+
+    for clue in iter_clues(args.data_dir, seasons=args.season, rounds=args.round,
+                           min_value=args.min_value, max_value=args.max_value):
+        record = clue._asdict()
+        record["air_date"] = clue.air_date.isoformat() if clue.air_date else None
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
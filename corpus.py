@@ -0,0 +1,680 @@
+"""
+corpus.py — Season file loading for the Jeopardy Trainer.
+Call load_corpus() from the main app. No Streamlit dependency, so batch tools
+can import it without pulling in the UI.
+
+Caching / incremental ingest:
+  Each parsed season file is stored as its own columnar Parquet part in
+  .corpus_cache/seasons/ and the parts are concatenated on later starts.
+  .corpus_cache/manifest.json records every ingested file's name, size and
+  mtime plus its row count, stored columns and schema savings.
+
+  ingest() (run by load_corpus(), or `python corpus.py ingest`) parses only
+  season files that are new or whose size/mtime changed and drops parts for
+  removed files; untouched seasons are never re-read. Parquet support comes
+  from pyarrow, which ships with Streamlit; without it the TSVs are simply
+  re-parsed on every start. Season files may be gzip/zstd compressed (see
+  clue_stream.open_season); they are decompressed as a stream while parsing.
+
+Parallel ingest:
+  On a cache miss each season file is parsed in its own worker process and
+  tagged with its season there; chunks are merged in sorted file order so the
+  result is identical to a serial parse. Small corpora (under
+  PARALLEL_MIN_BYTES, or a single file / single core) are parsed serially,
+  where process start-up would cost more than it saves. Parts re-tagged
+  after a rule change are spread over a process pool the same way. Every
+  task carries the caller's tag rules (tag_engine.taxonomy_spec()), so
+  workers tag with them under any start method, not whatever
+  tag_taxonomy.json holds when a spawned worker imports the engine.
+
+Cleaning:
+  clean_clues() runs once per season at ingest: it computes the clue_id
+  column from the raw text, then removes backslash escapes, markup and HTML
+  entities from the text columns (clue_stream.clean_text). Together with
+  the schema below, consumers read clean strings and real ints and never
+  re-coerce per row; the results are cached with the season parts.
+
+Study tags:
+  tag_season() (after cleaning, before the schema) runs the tag engine over
+  the season once and stores the result as a categorical tag column, so
+  the app reads a clue's tag instead of re-running the rules on every draw,
+  and tag-based filters are plain column comparisons. The column is cached
+  with the season parts and each manifest entry records the tag engine's
+  RULES_FINGERPRINT. When the rules change, ingest() re-tags the cached
+  parts in place (no TSV re-parse); otherwise restarts skip tagging.
+  The rules the cache was tagged with are kept in .corpus_cache/
+  tag_rules.json, so a re-tag is incremental (tag_engine.retag): only clues
+  an edited rule could move are re-evaluated. `python corpus.py ingest`
+  prints the before/after count of every tag that moved, and refreshes the
+  tag rule playground's trigram index (tag_playground.py).
+  With TRIVIA_TAG_MASKS=1 each part also gets the multi-label bitmask
+  columns (tag_engine.MASK_COLUMNS: every tag a clue touches, not just the
+  first); turning the option on or off re-tags the cached parts once.
+  The rules come from the engine's current taxonomy (tag_taxonomy.json);
+  ingest pins it while it runs, so a hot reload never lands mid-ingest.
+
+Schema:
+  apply_schema() gives the frame compact dtypes before it is cached: season,
+  round and category become categoricals, clue_value / daily_double_value
+  become int32 and air_date becomes datetime64. The bytes saved are kept in
+  df.attrs["schema_bytes_saved"]; run `python corpus.py` to see them.
+
+Sharing:
+  One frame is shared by every Streamlit session but never handed out as
+  is: each user takes df.copy(deep=False), which shares the column buffers
+  but not the column set, and under copy-on-write any write to it copies
+  the column first — so df.loc[...] = x, df["x"] = …, del df[col] and
+  drop(inplace=True) all stay local. freeze_corpus() additionally makes the
+  shared frame's numpy buffers (numeric columns, categorical codes)
+  read-only, so a write that reaches them anyway raises ValueError. Text
+  columns stay Arrow-backed; they rely on the shallow copy alone.
+
+Corpus subsets:
+  load_corpus(seasons=…, rounds=…) restricts the corpus to some seasons and
+  rounds: unselected season files are never read, unselected rounds are
+  dropped before the frame is returned and unused categories are pruned, so
+  a 3-season or Final-Jeopardy-only corpus costs a fraction of the full one.
+  ProgressiveCorpus and clue_store.open_clue_store take the same selectors.
+
+Progressive loading:
+  ProgressiveCorpus makes one season (the newest, or a random one) playable
+  immediately and folds the remaining seasons in on a background thread.
+  Rows are only ever appended, so positional indexes handed out earlier
+  (current clue, history) stay valid once the full corpus lands. With a
+  fresh Parquet cache the whole corpus loads synchronously instead.
+
+Row order:
+  load_corpus() returns rows in (season, row-in-file) order — files are read
+  in season-number order and each file's rows keep their order (air-date
+  order for the shipped seasons) — and never shuffles; callers sample row
+  indexes instead. A progressive load does not: its frame keeps the first
+  season ahead of the others ([41, 30, …, 40] for "newest"), so the same
+  clue can sit at different positions depending on how the corpus was
+  loaded. Anything that must be reproducible across loads (seeded draws)
+  has to order rows by (season, row-in-file) itself rather than by position.
+"""
+
+import itertools
+import json
+import os
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from clue_stream import (
+    CLEAN_TRIGGER, clean_text, clue_id, open_season, season_files, season_label, select_seasons,
+)
+from tag_engine import (
+    PARALLEL_MIN_ROWS, adopt_taxonomy, decode_rules, encode_rules, pinned_taxonomy, retag,
+    tag_clues, tag_corpus, tag_masks, taxonomy, taxonomy_spec,
+)
+
+CACHE_DIRNAME = ".corpus_cache"
+CACHE_VERSION = 5   # bump when the cached frame's shape/semantics change
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024   # below this a process pool is slower than a loop
+TAG_MASKS = os.environ.get("TRIVIA_TAG_MASKS", "") == "1"   # store multi-label tag bitmasks
+
+# ─── Season files ─────────────────────────────────────────────────────────────
+
+def parse_season(path: str):
+    """Parse one season TSV and tag every row with its season. None on failure."""
+    try:
+        with open_season(path) as fh:   # streams .gz / .zst without inflating first
+            temp_df = pd.read_csv(fh, sep='\t', low_memory=False)
+    except Exception:
+        return None
+    temp_df['season'] = season_label(path)
+    return temp_df
+
+TEXT_COLUMNS = ("category", "comments", "answer", "question", "notes")
+
+def clean_clues(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add clue_id (from the raw text) and clean the text columns in place.
+    Only cells containing a backslash, '<' or '&' go through clean_text.
+    """
+    cols = [df[c] if c in df.columns else [""] * len(df) for c in ("category", "answer", "question")]
+    df["clue_id"] = [clue_id(cat, ans, q) for cat, ans, q in zip(*cols)]
+    for col in TEXT_COLUMNS:
+        if col not in df.columns:
+            continue
+        text = df[col]
+        dirty = text.notna() & text.astype(str).str.contains(CLEAN_TRIGGER, regex=True)
+        if dirty.any():
+            df.loc[dirty, col] = text[dirty].map(clean_text)
+    return df
+
+def tag_season(df: pd.DataFrame) -> pd.DataFrame:
+    """(Re)compute the study-tag column: one tag engine pass over the cleaned text."""
+    if "category" in df.columns:
+        tags = tag_corpus(df)
+    else:
+        tags = tag_clues([""] * len(df), df["answer"])
+    df["tag"] = pd.Categorical(tags, categories=taxonomy().all_tags)
+    return _mask_season(df)
+
+def _mask_season(df: pd.DataFrame) -> pd.DataFrame:
+    """Add (TAG_MASKS on) or drop (off) the multi-label bitmask columns."""
+    if TAG_MASKS and "category" in df.columns:
+        masks = tag_masks(df)
+        for w, col in enumerate(taxonomy().mask_columns):
+            df[col] = masks[:, w]
+    else:
+        df = df.drop(columns=[c for c in df.columns if c.startswith("tag_mask_")])
+    return df
+
+def load_season(path: str) -> tuple:
+    """
+    parse_season + the corpus-wide row filter, cleaning and schema: returns
+    (frame, schema_bytes_saved), or (None, 0) if the file cannot be parsed.
+    This is the unit of work for both ingest and the parse pool.
+    """
+    temp_df = parse_season(path)
+    if temp_df is None:
+        return None, 0
+    temp_df = temp_df.dropna(subset=['answer', 'question']).reset_index(drop=True)
+    return apply_schema(tag_season(clean_clues(temp_df)))
+
+def _load_season_with(path: str, spec: tuple) -> tuple:
+    adopt_taxonomy(spec)
+    return load_season(path)
+
+def _parse_all(files: list, workers=None) -> list:
+    """
+    load_season() for each file, results in the order given. Uses a process
+    pool when the files are big enough to benefit; workers=1 forces serial
+    parsing. Falls back to serial if the pool cannot be started.
+    """
+    workers = workers or os.cpu_count() or 1
+    total_bytes = sum(os.path.getsize(f) for f in files)
+    if workers > 1 and len(files) > 1 and total_bytes >= PARALLEL_MIN_BYTES:
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+                specs = [taxonomy_spec()] * len(files)
+                return list(pool.map(_load_season_with, files, specs))   # map() keeps input order
+        except Exception:
+            pass
+    return [load_season(f) for f in files]
+
+def file_fingerprint(files: list) -> list:
+    """[{name, size, mtime_ns}] for each file — the cache key."""
+    out = []
+    for f in files:
+        st = os.stat(f)
+        out.append({"name": os.path.basename(f), "size": st.st_size, "mtime_ns": st.st_mtime_ns})
+    return out
+
+# ─── Schema ───────────────────────────────────────────────────────────────────
+
+# column → dtype applied at load time; columns missing from a file are skipped
+CORPUS_SCHEMA = {
+    "season":             "category",
+    "round":              "category",
+    "category":           "category",
+    "tag":                "category",
+    "clue_value":         "int32",
+    "daily_double_value": "int32",
+    "air_date":           "datetime64[ns]",
+}
+
+def apply_schema(df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
+    """
+    Return (typed_df, bytes_saved). Ints are coerced with missing/garbage → 0,
+    dates with unparseable → NaT, so a bad row never fails the whole load.
+    """
+    before = int(df.memory_usage(deep=True).sum())
+    df = df.copy()
+    for col, dtype in CORPUS_SCHEMA.items():
+        if col not in df.columns:
+            continue
+        if dtype.startswith("int"):
+            values = df[col]
+            if not pd.api.types.is_numeric_dtype(values):
+                values = values.astype(str).str.replace(r"[$,]", "", regex=True)
+            df[col] = pd.to_numeric(values, errors="coerce").fillna(0).astype(dtype)
+        elif dtype.startswith("datetime"):
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+        else:
+            df[col] = df[col].astype(dtype)
+    return df, before - int(df.memory_usage(deep=True).sum())
+
+def _readonly(arr):
+    arr = arr.copy()
+    arr.flags.writeable = False
+    return arr
+
+def freeze_corpus(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a copy of df whose numpy buffers are read-only: numeric columns
+    and the codes of categoricals (which keep their shared categories).
+    Arrow-backed text columns are passed through as they are — converting
+    them to object arrays would double the frame — and stay protected by
+    handing each user df.copy(deep=False) rather than the frame itself,
+    where copy-on-write copies a column before any write (see "Sharing").
+    """
+    cols = {}
+    for col in df.columns:
+        s = df[col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            cols[col] = pd.Categorical.from_codes(_readonly(s.cat.codes.to_numpy()), dtype=s.dtype)
+        elif s.dtype.kind in "biufcmM":
+            cols[col] = _readonly(s.to_numpy())
+        else:
+            cols[col] = s.array
+    frozen = pd.DataFrame(cols, index=df.index, copy=False)
+    frozen.columns = df.columns
+    frozen.attrs.update(df.attrs)
+    return frozen
+
+# ─── Columnar cache / manifest ────────────────────────────────────────────────
+
+def _manifest_path(data_dir: str) -> str:
+    return os.path.join(data_dir, CACHE_DIRNAME, "manifest.json")
+
+def _part_path(data_dir: str, name: str) -> str:
+    return os.path.join(data_dir, CACHE_DIRNAME, "seasons", name + ".parquet")
+
+def read_manifest(data_dir: str = ".") -> dict:
+    """
+    The ingest manifest: {"version": int, "seasons": {file_name: entry}} where
+    entry records the file's size/mtime, its row count, the columns stored in
+    its part, the bytes the schema saved and the tag rules it was tagged with. Empty if missing or outdated.
+    """
+    try:
+        with open(_manifest_path(data_dir)) as fh:
+            manifest = json.load(fh)
+        if manifest.get("version") == CACHE_VERSION:
+            return manifest
+    except Exception:
+        pass
+    return {"version": CACHE_VERSION, "seasons": {}}
+
+def _write_manifest(data_dir: str, manifest: dict):
+    """Atomic write (temp file + os.replace); silently skipped if read-only."""
+    path = _manifest_path(data_dir)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w") as fh:
+            json.dump(manifest, fh, indent=1)
+        os.replace(path + ".tmp", path)
+    except Exception:
+        pass
+
+def _rules_path(data_dir: str) -> str:
+    return os.path.join(data_dir, CACHE_DIRNAME, "tag_rules.json")
+
+def _read_rules(data_dir: str) -> dict:
+    """The tag maps the cache was last tagged with ({} if unknown)."""
+    try:
+        with open(_rules_path(data_dir)) as fh:
+            return json.load(fh)
+    except Exception:
+        return {}
+
+def _write_rules(data_dir: str):
+    path = _rules_path(data_dir)
+    try:
+        with open(path + ".tmp", "w") as fh:
+            tax = taxonomy()
+            json.dump({"fingerprint":  tax.fingerprint,
+                       "category_map": encode_rules(tax.category_map),
+                       "content_map":  encode_rules(tax.content_map)}, fh, indent=1)
+        os.replace(path + ".tmp", path)
+    except Exception:
+        pass
+
+def _retag_part(part: pd.DataFrame, tagged_with, old_rules: dict, spec: tuple) -> pd.DataFrame:
+    """Bring a cached part's tag column up to the rules in spec (a taxonomy_spec())."""
+    adopt_taxonomy(spec)
+    if "tag" in part.columns and old_rules.get("fingerprint") == tagged_with:
+        tags = retag(part, decode_rules(old_rules["category_map"]), decode_rules(old_rules["content_map"]))
+        part["tag"] = pd.Categorical(tags, categories=taxonomy().all_tags)
+        return _mask_season(part)
+    return tag_season(part)
+
+def _retag_all(parts: list, tagged_with: list, old_rules: dict, workers=None) -> list:
+    """
+    _retag_part() for each part, results in the order given. Uses a process
+    pool when there are enough clues to pay for it (tag_engine.PARALLEL_MIN_ROWS);
+    falls back to serial like _parse_all.
+    """
+    workers = workers or os.cpu_count() or 1
+    spec    = taxonomy_spec()
+    if workers > 1 and len(parts) > 1 and sum(map(len, parts)) >= 2 * PARALLEL_MIN_ROWS:
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(parts))) as pool:
+                return list(pool.map(_retag_part, parts, tagged_with,
+                                     [old_rules] * len(parts), [spec] * len(parts)))
+        except Exception:
+            pass
+    return [_retag_part(part, rules, old_rules, spec) for part, rules in zip(parts, tagged_with)]
+
+def _tags_current(entry: dict) -> bool:
+    """True when a manifest entry's part was tagged with today's rules and mask setting."""
+    return entry.get("tag_rules") == taxonomy().fingerprint and bool(entry.get("tag_masks")) == TAG_MASKS
+
+def _is_fresh(data_dir: str, entry, fp: dict) -> bool:
+    return bool(entry) \
+        and entry.get("size") == fp["size"] and entry.get("mtime_ns") == fp["mtime_ns"] \
+        and os.path.exists(_part_path(data_dir, fp["name"]))
+
+def cache_is_fresh(data_dir: str = ".", seasons=None) -> bool:
+    """True when every (selected) season file has an up-to-date part."""
+    files = select_seasons(season_files(data_dir), seasons)
+    entries = read_manifest(data_dir)["seasons"]
+    return bool(files) and all(
+        _is_fresh(data_dir, entries.get(fp["name"]), fp)
+        and _tags_current(entries[fp["name"]])
+        for fp in file_fingerprint(files)
+    )
+
+def _ingest(data_dir: str, workers=None, force: bool = False, seasons=None) -> tuple[dict, dict]:
+    """
+    Bring the per-season Parquet parts in line with the season files.
+    Returns (report, fresh) where report lists file names as added / updated /
+    retagged / unchanged / removed (plus "tag_counts": {tag: [before, after]}
+    over the retagged parts), and fresh maps each re-parsed file name to its frame
+    (so a read-only cache folder still yields a usable corpus).
+    seasons limits which files are (re)parsed; parts of unselected seasons
+    are left alone, and parts are only removed when their file is gone.
+    Taxonomy reloads wait until it is done, so every part is tagged and
+    stamped with the same rules.
+    """
+    with pinned_taxonomy() as tax:
+        return _sync_parts(data_dir, tax.fingerprint, workers, force, seasons)
+
+def _sync_parts(data_dir: str, fingerprint: str, workers, force: bool, seasons) -> tuple[dict, dict]:
+    all_files = season_files(data_dir)
+    files    = select_seasons(all_files, seasons)
+    fps      = {fp["name"]: fp for fp in file_fingerprint(all_files)}
+    manifest = read_manifest(data_dir)
+    seasons  = manifest["seasons"]
+    report   = {"added": [], "updated": [], "retagged": [], "unchanged": [], "removed": [],
+                "tag_counts": {}}
+    old_rules = _read_rules(data_dir)
+
+    for name in [n for n in seasons if n not in fps]:
+        report["removed"].append(name)
+        seasons.pop(name)
+        try:
+            os.remove(_part_path(data_dir, name))
+        except OSError:
+            pass
+
+    stale, fresh, retag_names, retag_parts = [], {}, [], []
+    for f in files:
+        name = os.path.basename(f)
+        if force or not _is_fresh(data_dir, seasons.get(name), fps[name]):
+            report["updated" if name in seasons else "added"].append(name)
+            stale.append(f)
+        elif _tags_current(seasons[name]):
+            report["unchanged"].append(name)
+        else:
+            # tag rules changed since this part was written: re-tag it in place
+            part = _read_part(data_dir, name, normalize=False)
+            if part is None:
+                report["updated"].append(name)
+                stale.append(f)
+                continue
+            retag_names.append(name)
+            retag_parts.append(part)
+
+    counts = report["tag_counts"]
+    for part in retag_parts:
+        for tag, n in (part["tag"].value_counts() if "tag" in part.columns else {}).items():
+            counts.setdefault(tag, [0, 0])[0] += int(n)
+    tagged_with = [seasons[name].get("tag_rules") for name in retag_names]
+    for name, part in zip(retag_names, _retag_all(retag_parts, tagged_with, old_rules, workers)):
+        fresh[name] = part
+        report["retagged"].append(name)
+        for tag, n in part["tag"].value_counts().items():
+            counts.setdefault(tag, [0, 0])[1] += int(n)
+        if _write_part(data_dir, name, part):
+            seasons[name].update(tag_rules=fingerprint, tag_masks=TAG_MASKS,
+                                 columns=list(part.columns))
+            _write_manifest(data_dir, manifest)   # keep entry and part in step if interrupted
+
+    for f, (part, saved) in zip(stale, _parse_all(stale, workers)):
+        name = os.path.basename(f)
+        if part is None:
+            seasons.pop(name, None)
+            continue
+        fresh[name] = part
+        if not _write_part(data_dir, name, part):
+            continue
+        seasons[name] = {
+            "size":               fps[name]["size"],
+            "mtime_ns":           fps[name]["mtime_ns"],
+            "rows":               len(part),
+            "columns":            list(part.columns),
+            "schema_bytes_saved": saved,
+            "tag_rules":          fingerprint,
+            "tag_masks":          TAG_MASKS,
+        }
+
+    if stale or report["removed"] or report["retagged"]:
+        _write_manifest(data_dir, manifest)
+    tax = taxonomy()
+    outdated = (old_rules.get("fingerprint") != fingerprint
+                or old_rules.get("category_map") != encode_rules(tax.category_map)
+                or old_rules.get("content_map") != encode_rules(tax.content_map))   # pre-"linear" encoding
+    if outdated and any(e.get("tag_rules") == fingerprint for e in seasons.values()):
+        _write_rules(data_dir)
+    return report, fresh
+
+def ingest(data_dir: str = ".", workers=None, force: bool = False) -> dict:
+    """
+    Incrementally update the corpus cache: only new or changed season files
+    are parsed, removed ones are dropped, everything else is left untouched.
+    force=True re-parses every file. Returns the added/updated/retagged/
+    unchanged/removed report. load_corpus() runs this on every start.
+    """
+    return _ingest(data_dir, workers, force)[0]
+
+def _write_part(data_dir: str, name: str, part: pd.DataFrame) -> bool:
+    """Atomically (re)write one season part; False if the cache is not writable."""
+    path = _part_path(data_dir, name)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        part.to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+        return True
+    except Exception:
+        return False
+
+def _read_part(data_dir: str, name: str, normalize: bool = True):
+    try:
+        part = pd.read_parquet(_part_path(data_dir, name))
+    except Exception:
+        return None
+    if normalize and TAG_MASKS != all(c in part.columns for c in taxonomy().mask_columns):
+        part = _mask_season(part)   # written under the other mask setting
+    return part
+
+def _select_rounds(df: pd.DataFrame, rounds=None) -> pd.DataFrame:
+    """Rows in the given rounds only (None keeps all), with unused categories pruned."""
+    if rounds is None or 'round' not in df.columns:
+        return df
+    df = df[df['round'].isin([int(r) for r in rounds])].reset_index(drop=True)
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].cat.remove_unused_categories()
+    return df
+
+def _concat_parts(parts: list) -> pd.DataFrame:
+    """Concatenate corpus parts, merging categoricals instead of letting
+    mismatched categories fall back to object dtype."""
+    out = pd.concat(parts, ignore_index=True)
+    for col, dtype in CORPUS_SCHEMA.items():
+        if dtype != "category" or col not in out.columns:
+            continue
+        if all(isinstance(p[col].dtype, pd.CategoricalDtype) for p in parts):
+            out[col] = union_categoricals([p[col] for p in parts], ignore_order=True)
+        else:
+            # Parquet drops the categorical flag on non-string columns (round)
+            out[col] = out[col].astype("category")
+    return out
+
+# ─── Public entry point ───────────────────────────────────────────────────────
+
+def load_corpus(data_dir: str = ".", use_cache: bool = True, workers=None,
+                seasons=None, rounds=None):
+    """
+    Load every season file in data_dir into one DataFrame, dropping rows
+    without an answer or question. Returns None if there is nothing to load.
+    workers caps the parse pool size (default: all cores; 1 = serial).
+    seasons / rounds (iterables of numbers) restrict what is read and kept.
+    """
+    files = select_seasons(season_files(data_dir), seasons)
+    if not files:
+        return None
+
+    if not use_cache:
+        loaded = _parse_all(files, workers)
+        parts  = [_select_rounds(part, rounds) for part, _ in loaded if part is not None]
+        saved  = sum(s for _, s in loaded)
+    else:
+        _, fresh = _ingest(data_dir, workers, seasons=seasons)
+        seasons  = read_manifest(data_dir)["seasons"]
+        parts, saved = [], 0
+        for f in files:
+            name = os.path.basename(f)
+            part = fresh.get(name)
+            if part is None:
+                part = _read_part(data_dir, name)
+            if part is not None:
+                parts.append(_select_rounds(part, rounds))
+                saved += seasons.get(name, {}).get("schema_bytes_saved", 0)
+    if not parts:
+        return None
+
+    df = _concat_parts(parts)
+    df.attrs["schema_bytes_saved"] = saved
+    return df
+
+# ─── Progressive loading ──────────────────────────────────────────────────────
+
+_HOLDER_IDS = itertools.count(1)
+
+class ProgressiveCorpus:
+    """
+    Holder for a corpus that grows while the app is already serving.
+    Read .df on every rerun — it is swapped (never mutated) as seasons land.
+    .ready is set once the full corpus has been published, or once the
+    background load gave up: then .error holds the exception and .df stays
+    partial, so drop the holder and start a new one to retry.
+
+    Row positions are only meaningful within one holder: a replacement may
+    publish another layout (see "Row order"). .id tells holders apart.
+
+    prepare(part) is applied to each part before it is published and
+    finalize(frame) to every published frame (e.g. freeze_corpus).
+    """
+
+    def __init__(self, data_dir: str = ".", first: str = "newest", prepare=None, finalize=None,
+                 seasons=None, rounds=None):
+        self.id       = next(_HOLDER_IDS)
+        self.data_dir = data_dir
+        self.seasons  = seasons        # load_corpus selectors
+        self.rounds   = rounds
+        self.first    = first          # "newest" or "random"
+        self.prepare  = prepare  or (lambda part: part)
+        self.finalize = finalize or (lambda frame: frame)
+        self.df       = None
+        self.ready    = threading.Event()
+        self.error    = None           # set if the background load fails
+        self._head    = None           # prepared first season, kept until the rest lands
+
+    def _pick_first(self, files: list) -> str:
+        if self.first == "random":
+            return random.choice(files)
+        numbered = [f for f in files if season_label(f).isdigit()]
+        return max(numbered, key=lambda f: int(season_label(f))) if numbered else files[-1]
+
+    def start(self):
+        """Publish the first frame, then load the rest in the background."""
+        files = select_seasons(season_files(self.data_dir), self.seasons)
+        if not files:
+            self.ready.set()
+            return self
+
+        if cache_is_fresh(self.data_dir, self.seasons) or len(files) == 1:
+            full = self._load_full()
+            self.df = None if full is None else self.finalize(self.prepare(full))
+            self.ready.set()
+            return self
+
+        first_file = self._pick_first(files)
+        head, _ = load_season(first_file)
+        if head is not None:
+            self._head = self.prepare(_select_rounds(head, self.rounds))
+            self.df = self.finalize(self._head)
+        threading.Thread(
+            target=self._load_rest, args=(season_label(first_file),),
+            name="corpus-loader", daemon=True,
+        ).start()
+        return self
+
+    def _load_full(self):
+        return load_corpus(self.data_dir, seasons=self.seasons, rounds=self.rounds)
+
+    def _load_rest(self, first_label: str):
+        try:
+            full = self._load_full()   # also ingests into the Parquet cache
+            if full is None:
+                return
+            if self._head is None:
+                self.df = self.finalize(self.prepare(full))
+                return
+            rest = full[full['season'] != first_label].reset_index(drop=True)
+            self.df = self.finalize(_concat_parts([self._head, self.prepare(rest)]))
+        except Exception as e:
+            self.error = e
+        finally:
+            self._head = None
+            self.ready.set()
+
+def _print_stats(data_dir: str):
+    corpus = load_corpus(data_dir)
+    if corpus is None:
+        print("No season files found.")
+        return
+    used = corpus.memory_usage(deep=True).sum()
+    print(f"{len(corpus):,} clues from {corpus['season'].nunique()} seasons")
+    print(f"In memory: {used / 1e6:.1f} MB "
+          f"(schema saved {corpus.attrs.get('schema_bytes_saved', 0) / 1e6:.1f} MB)")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Jeopardy Trainer corpus tools.")
+    parser.add_argument("command", nargs="?", default="stats", choices=["stats", "ingest"],
+                        help="stats: load and summarize the corpus (default); "
+                             "ingest: parse only new or changed season files")
+    parser.add_argument("--data-dir", default=".", help="folder holding the season TSVs")
+    parser.add_argument("--workers", type=int, default=None, help="parse pool size (1 = serial)")
+    parser.add_argument("--force", action="store_true", help="ingest: re-parse every file")
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        report = ingest(args.data_dir, workers=args.workers, force=args.force)
+        for status in ("added", "updated", "retagged", "removed", "unchanged"):
+            names = report[status]
+            print(f"{status:>9}: {len(names):>3}  {', '.join(names) if status != 'unchanged' else ''}".rstrip())
+        moved = {t: c for t, c in report["tag_counts"].items() if c[0] != c[1]}
+        if moved:
+            print("tag counts (before → after):")
+            for tag, (before, after) in sorted(moved.items(), key=lambda kv: -abs(kv[1][1] - kv[1][0])):
+                print(f"  {tag:<28} {before:>7,} → {after:>7,}  ({after - before:+,})")
+        elif report["retagged"]:
+            print("tag counts unchanged")
+        from tag_playground import open_trigram_index   # the rule playground's index
+        full = load_corpus(args.data_dir)
+        if full is not None:
+            index = open_trigram_index(full, args.data_dir)
+            print(f"trigram index: {index.n_rows:,} clues, {len(index.keys):,} trigrams posted")
+    else:
+        _print_stats(args.data_dir)
@@ -0,0 +1,1101 @@
+"""
+tag_engine.py — Study-tag engine for the Jeopardy Trainer.
+Call identify_universal_cat(row) for one clue or tag_clues() / tag_corpus()
+for many. No Streamlit dependency, so batch tools can tag the corpus too.
+
+Rules:
+  Two ordered passes. Pass 1 (CATEGORY_MAP) looks at the category string
+  only; pass 2 (CONTENT_MAP) at category + answer text. Within a pass the
+  first matching label wins; a clue matching neither is "Other". Tags are
+  ordered from most specific to most general within each pass, so specific
+  tags (Shakespeare) must come before their parent (Literature).
+
+Taxonomy file:
+  The rules live in tag_taxonomy.json (or $TRIVIA_TAXONOMY), not in code:
+  {"format": 1, "revision": n, "category": {section: [[label, pattern], …]},
+  "content": {…}}, with a third "linear" element marking RE2 rules. Sections
+  only group rules for editors; order is priority. load_taxonomy() compiles
+  a file into a Taxonomy (maps, passes, ALL_TAGS, fingerprint, mask layout)
+  and caches each pattern's parse-tree analysis in .corpus_cache/
+  taxonomy_compiled.json next to the file, keyed by rule fingerprint.
+  reload_taxonomy() stats the file and, if it changed, builds the new
+  Taxonomy off to the side and swaps the module's TAXONOMY reference in one
+  assignment, so a running app picks up edits without a restart; a file
+  that fails to parse or compile keeps the old rules and warns. The module
+  names CATEGORY_MAP, ALL_TAGS, RULES_FINGERPRINT, … alias the current
+  taxonomy; jobs that need one consistent rule set read taxonomy() once, and
+  jobs that also stamp a cache with its fingerprint hold pinned_taxonomy(),
+  which defers reloads until they finish.
+
+Memoization:
+  Pass 1 depends only on the category, and the corpus has ~26k distinct
+  categories across ~160k clues, so category_tag() is computed once per
+  distinct category and reused for every clue in it. Only the clues whose
+  category misses pass 1 fall through to the per-clue content pass.
+  tag_corpus() goes further for a categorical column: pass 1 runs over the
+  column's categories and is broadcast to rows through the category codes.
+
+Compiled passes:
+  Each pass is a TagPass: its patterns are compiled once, in map order, and
+  held by the pass, so matching never goes through re's small shared
+  pattern cache. TagPass.first() returns the first label whose pattern
+  matches, exactly the old loop's first-match-wins order.
+  One alternation of named groups per pass was measured too: CPython's re
+  tries every branch at every position and loses the per-pattern literal
+  scanning, so both a lookahead-per-rule single match (40s) and alternation
+  + priority resolution (82s) were slower than the rule loop (32s).
+  `python tag_engine.py verify` checks the engine against the plain
+  re.search loop (reference_tag) over the whole corpus.
+
+Keyword prefilter:
+  Most content rules are alternations of literal keywords, and most clues
+  that reach pass 2 match none of them. required_literals() reads each
+  pattern's parse tree for a set of literal strings one of which every
+  match must contain (e.g. {"nfl", "super bowl", "quarterback", …}); a
+  KeywordIndex (an Aho–Corasick automaton over all of those literals) finds
+  in one walk over the text which rules could possibly match. Only those
+  rules' regexes run, still in priority order, so an "Other" clue usually
+  costs one automaton walk instead of ~70 regex searches. The category pass
+  is prefiltered the same way. Rules without an
+  extractable literal are always evaluated. Literals of case-insensitive
+  ((?i)) patterns are lowercased like the texts. The filter only ever skips
+  a rule whose required literal is absent, so results are unchanged.
+
+Backtracking guards:
+  Every rule is checked when its pass is built (backtracking_risk):
+  nested unbounded quantifiers such as (a+)+ can backtrack exponentially,
+  and a .* wildcard between other parts (lincoln.*war) quadratically.
+  A rule wrapped in linear(...) is compiled with RE2 (the optional
+  google-re2 package), which matches in linear time. Without RE2, risky
+  rules only see the first GUARD_MAX_CHARS characters of a text (clue texts
+  are ~400 at most), and exponential-shape rules are disabled with a
+  warning instead of being allowed to hang tagging. Any single search that
+  takes longer than RULE_BUDGET_S is recorded in the pass's overruns and
+  warned about once per rule. `python tag_engine.py lint` lists each rule's
+  risk and mode.
+
+Rule fingerprint:
+  rules_fingerprint() hashes the ordered maps (labels, patterns, order) plus
+  ENGINE_VERSION. Anything that caches tags stores RULES_FINGERPRINT with
+  them and recomputes when it no longer matches, so editing a rule retags
+  automatically and deploys that leave the taxonomy alone skip tagging.
+  Bump ENGINE_VERSION when matching itself changes (e.g. text normalization).
+
+Incremental re-tagging:
+  retag(df, old_category_map, old_content_map) updates a tag column made
+  with older rules without re-running every rule on every clue. Per pass,
+  a rule before the first edit can only keep winning. When the edit only
+  changed patterns in place (same labels, same order), a clue can only move
+  if one of the *edited* rules now matches ahead of its old winner, or its
+  old winner was edited and stopped matching; the edited rules alone are run
+  (behind their own keyword prefilter) and the full pass only for clues
+  whose winner was edited away. Added, removed or reordered labels fall
+  back to re-running the pass from the first difference on.
+
+Benchmark / golden snapshot:
+  `python tag_engine.py bench` tags every season file from scratch and
+  prints clues/sec, the time and input count of each pass and the tag
+  distribution. tag_golden.jsonl (committed) holds the expected tag of
+  every clue id plus the engine's speedup over reference_tag() when it was
+  written; `bench --check` diffs the current engine against it and exits
+  non-zero on any clue that moved tag or on a speedup that fell by more than
+  --max-slowdown. The speedup is measured against a reference_tag() pass
+  timed in the same run, so a slower CI box does not read as a regression.
+  After an intentional rule change, refresh it with `bench --update-golden`.
+
+Multi-label masks:
+  The tag column keeps only the first match. tag_masks() instead runs every
+  rule of both passes (behind the same prefilters) and packs the full set
+  of matching labels into MASK_WORDS uint64 words per clue — bit i is
+  ALL_TAGS[i] — stored as the MASK_COLUMNS. corpus.py adds them at ingest
+  when TRIVIA_TAG_MASKS=1. rows_with_tags() answers "clues touching Opera"
+  (any/all of several tags) with vectorized bit operations and
+  tags_in_mask() lists one clue's labels.
+
+Parallel tagging:
+  Tagging is CPU-bound regex work, so tag_clues_parallel() /
+  tag_corpus_parallel() split the clues into contiguous row ranges (one per
+  worker, none under PARALLEL_MIN_ROWS) and tag each in a process pool.
+  Each shard ships the submitting process's rules (taxonomy_spec()) and the
+  worker adopts them, so a spawn/forkserver worker never tags with a newer
+  tag_taxonomy.json than the caller.
+  pool.map returns shards in input order and a clue's tag depends only on
+  its own text, so the concatenated column is identical to the serial
+  engine's. Too few clues, one core, or a pool that cannot start all fall
+  back to the serial path. `python tag_engine.py bench --workers N` times it.
+
+Profiling:
+  profile_corpus(df) tags df on a private copy of the taxonomy with
+  per-rule accounting switched on and returns one row per (pass, label): regex evaluations, hits and the time
+  spent in that rule's searches. Rules the keyword prefilter skips are not
+  evaluated and cost nothing; pass 1 is counted per distinct category, as
+  it runs. `python tag_engine.py profile --sort time` prints the report;
+  the app shows the same table in a debug expander (open it with ?debug=1).
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+try:
+    from re import _parser as sre_parse   # Python 3.11+
+    from re._casefix import _EXTRA_CASES as _CASE_FOLDS
+except ImportError:
+    import sre_parse
+    from sre_compile import _ignorecase_fixes as _CASE_FOLDS
+
+try:
+    import re2   # optional (pip install google-re2): linear-time matching
+except ImportError:
+    re2 = None
+
+ENGINE_VERSION  = 1       # part of the rule fingerprint; bump when matching semantics change
+ANALYSIS_FORMAT = 2       # on-disk pattern analysis layout/semantics; bump to drop stale caches
+RULE_BUDGET_S   = 0.05    # a single rule search slower than this is reported
+GUARD_MAX_CHARS = 2000    # text seen by risky rules that cannot run on RE2
+PARALLEL_MIN_ROWS = 20_000   # smallest shard worth a worker process
+
+class linear(str):
+    """A tag pattern that opts in to linear-time (RE2) matching."""
+
+def same_rule(a: str, b: str) -> bool:
+    """Equal patterns with the same linear flag (linear("x") == "x" as strings)."""
+    return a == b and isinstance(a, linear) == isinstance(b, linear)
+
+def encode_rules(rule_map: dict) -> list:
+    """JSON-safe [[label, pattern or ["linear", pattern]], …] in rule order."""
+    return [[label, ["linear", pattern] if isinstance(pattern, linear) else pattern]
+            for label, pattern in rule_map.items()]
+
+def decode_rules(items: list) -> dict:
+    """Inverse of encode_rules()."""
+    return {label: linear(pattern[1]) if isinstance(pattern, list) else pattern
+            for label, pattern in items}
+
+def rules_fingerprint(category_map: dict, content_map: dict) -> str:
+    """
+    Short hash of the ordered tag maps; equal fingerprints ⇒ equal tags.
+    A linear(...) pattern hashes with its flag, since RE2 vs re (or a
+    guarded re) can match differently.
+    """
+    payload = json.dumps([ENGINE_VERSION, encode_rules(category_map), encode_rules(content_map)])
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+# ─── Matching ─────────────────────────────────────────────────────────────────
+
+def _required(items, ignorecase: bool = False):
+    """
+    Literal strings one of which any match of parsed items must contain,
+    or None when that cannot be shown (classes, optional parts, …).
+    Under IGNORECASE the literals are lowercased, as the texts are, and a
+    character re also folds to a different lowercase one (s ~ ſ, i ~ ı, …)
+    ends the literal instead of being part of it.
+    """
+    options, run = [], []
+
+    def flush():
+        if run:
+            options.append({"".join(run)})
+            run.clear()
+
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            char = chr(av)
+            if ignorecase:
+                char = char.lower()
+                if len(char) != 1 or ord(char) in _CASE_FOLDS:
+                    flush()
+                    continue
+            run.append(char)
+            continue
+        flush()
+        if op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, sub = av
+            scoped = (ignorecase or bool(add_flags & re.IGNORECASE)) and not del_flags & re.IGNORECASE
+            options.append(_required(sub, scoped))
+        elif op is sre_parse.BRANCH:
+            branches = [_required(b, ignorecase) for b in av[1]]
+            options.append(None if None in branches else set().union(*branches))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            options.append(_required(av[2], ignorecase))
+    flush()
+    options = [o for o in options if o]
+    # the most selective choice: longest shortest-literal, then fewest literals
+    return max(options, key=lambda o: (min(map(len, o)), -len(o)), default=None)
+
+def required_literals(pattern: str):
+    """
+    Set of literals one of which every match of pattern contains, or None.
+    The literals are the ones to look for in the engine's lowercased texts.
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+        return _required(parsed, bool(parsed.state.flags & re.IGNORECASE))
+    except Exception:
+        return None
+
+def _risk(items, in_repeat: bool = False) -> set:
+    found = set()
+    for op, av in items:
+        if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            unbounded = av[1] == sre_parse.MAXREPEAT
+            if unbounded and in_repeat:
+                found.add("exponential")
+            if unbounded and len(av[2]) == 1 and av[2][0][0] in (sre_parse.ANY, sre_parse.IN, sre_parse.NOT_LITERAL):
+                found.add("polynomial")
+            found |= _risk(av[2], in_repeat or unbounded)
+        elif op is sre_parse.SUBPATTERN:
+            found |= _risk(av[-1], in_repeat)
+        elif op is sre_parse.BRANCH:
+            for branch in av[1]:
+                found |= _risk(branch, in_repeat)
+    return found
+
+def backtracking_risk(pattern: str):
+    """
+    "exponential" (an unbounded quantifier inside another), "polynomial"
+    (an unbounded wildcard/class repeat, e.g. .*) or None.
+    """
+    try:
+        found = _risk(sre_parse.parse(pattern))
+    except Exception:
+        return None
+    for level in ("exponential", "polynomial"):
+        if level in found:
+            return level
+    return None
+
+class KeywordIndex:
+    """
+    Aho–Corasick automaton over {keyword: ids}: candidates(text) returns the
+    ids of every keyword occurring anywhere in text, in one pass over it.
+    """
+
+    def __init__(self, keywords: dict):
+        self._goto = [{}]
+        self._out  = [set()]
+        for word, ids in keywords.items():
+            state = 0
+            for ch in word:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._out.append(set())
+                state = nxt
+            self._out[state] |= set(ids)
+
+        # failure links, breadth-first; outputs inherit along them
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+        self._out = [frozenset(o) for o in self._out]
+
+    def candidates(self, text: str) -> set:
+        goto, fail, out = self._goto, self._fail, self._out
+        found, state = set(), 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+class TagPass:
+    """
+    One ordered {label: pattern} pass, compiled once. With prefilter=True a
+    KeywordIndex over the rules' required literals picks the rules worth
+    running for each text; the rest cannot match and are skipped.
+
+    analysis ({pattern: (required literals, risk)}, as kept in .analysis)
+    skips re-parsing patterns already analysed, e.g. from the on-disk cache.
+    Each rule is validated on the way in; .modes[label] is "re", "re2",
+    "guarded" or "disabled" and .problems lists what validation found.
+    .overruns[label] = [count, worst_seconds, sample_text] for searches that
+    blew RULE_BUDGET_S. While .stats is a dict (see profile_corpus) each
+    search is also counted there as stats[label] = [evaluations, hits, seconds].
+    """
+
+    def __init__(self, rules: dict, prefilter: bool = False, analysis: dict = None):
+        self.labels   = list(rules)
+        self.rules    = []        # (label, compiled or None, text limit or None)
+        self.modes    = {}
+        self.problems = []        # (label, message)
+        self.overruns = {}
+        self.stats    = None      # per-rule profile, only while profiling
+        # pattern → (required literals, backtracking risk); reused when given
+        self.analysis = {p: (analysis or {}).get(p) or (required_literals(p), backtracking_risk(p))
+                         for p in rules.values()}
+        for label, pattern in rules.items():
+            self.rules.append(self._compile(label, pattern))
+        self.index  = None
+        if prefilter:
+            keywords, always = {}, set()
+            for i, pattern in enumerate(rules.values()):
+                literals = self.analysis[pattern][0]
+                if not literals:
+                    always.add(i)
+                    continue
+                for word in literals:
+                    keywords.setdefault(word, set()).add(i)
+            self.index  = KeywordIndex(keywords)
+            self.always = frozenset(always)
+
+    def _compile(self, label: str, pattern: str) -> tuple:
+        risk = self.analysis[pattern][1]
+        if isinstance(pattern, linear):
+            if re2 is not None:
+                try:
+                    self.modes[label] = "re2"
+                    return label, re2.compile(pattern), None
+                except Exception as e:
+                    self.problems.append((label, f"RE2 cannot compile it ({e}); using re"))
+            else:
+                self.problems.append((label, "marked linear but google-re2 is not installed"))
+        if risk == "exponential":
+            self.problems.append((label, "nested unbounded quantifiers (exponential backtracking); rule disabled"))
+            warnings.warn(f"tag rule {label!r} disabled: nested unbounded quantifiers", RuntimeWarning)
+            self.modes[label] = "disabled"
+            return label, None, None
+        if risk == "polynomial":
+            self.problems.append((label, f"unbounded wildcard; matched on the first {GUARD_MAX_CHARS} chars"))
+            self.modes[label] = "guarded"
+            return label, re.compile(pattern), GUARD_MAX_CHARS
+        self.modes[label] = "re"
+        return label, re.compile(pattern), None
+
+    def _over_budget(self, label: str, elapsed: float, text: str):
+        over = self.overruns.setdefault(label, [0, 0.0, text])
+        if not over[0]:
+            warnings.warn(f"tag rule {label!r} took {elapsed * 1000:.1f} ms on one text", RuntimeWarning)
+        over[0] += 1
+        if elapsed > over[1]:
+            over[1], over[2] = elapsed, text
+
+    def first(self, text: str):
+        """Label of the first rule matching text, or None."""
+        return next(self._hits(text), None)
+
+    def all(self, text: str) -> list:
+        """Labels of every rule matching text, in rule order."""
+        return list(self._hits(text))
+
+    def _hits(self, text: str):
+        """Matching labels in rule order, searched lazily."""
+        rules = self.rules
+        order = range(len(rules)) if self.index is None else \
+                sorted(self.index.candidates(text) | self.always)
+        clock = time.perf_counter
+        stats = self.stats
+        for i in order:
+            label, regex, limit = rules[i]
+            if regex is None:
+                continue
+            t0  = clock()
+            hit = regex.search(text if limit is None else text[:limit])
+            elapsed = clock() - t0
+            if elapsed > RULE_BUDGET_S:
+                self._over_budget(label, elapsed, text)
+            if stats is not None:
+                entry = stats[label]
+                entry[0] += 1
+                entry[2] += elapsed
+                if hit:
+                    entry[1] += 1
+            if hit:
+                yield label
+
+# ─── Taxonomy ─────────────────────────────────────────────────────────────────
+
+TAXONOMY_FORMAT = 1   # layout of the taxonomy file this engine reads
+TAXONOMY_PATH   = os.environ.get("TRIVIA_TAXONOMY") or \
+                  os.path.join(os.path.dirname(os.path.abspath(__file__)), "tag_taxonomy.json")
+
+class Taxonomy:
+    """
+    One compiled tag taxonomy: both ordered maps, their passes and everything
+    derived from the label list. Never changed once built (bar the pass-1
+    memo), so replacing the module's TAXONOMY swaps every rule at once.
+    """
+
+    def __init__(self, category_map: dict, content_map: dict, revision=None, analysis: dict = None):
+        self.category_map  = category_map
+        self.content_map   = content_map
+        self.revision      = revision
+        self.fingerprint   = rules_fingerprint(category_map, content_map)
+        self.all_tags      = list(dict.fromkeys(list(category_map) + list(content_map) + ["Other"]))
+        self.mask_words    = (len(self.all_tags) + 63) // 64
+        self.mask_columns  = [f"tag_mask_{w}" for w in range(self.mask_words)]
+        self.tag_bit       = {tag: 1 << i for i, tag in enumerate(self.all_tags)}
+        self.category_pass = TagPass(category_map, prefilter=True, analysis=analysis)
+        self.content_pass  = TagPass(content_map, prefilter=True, analysis=analysis)
+        self.memo          = {}   # lowercased category → pass-1 label or None
+
+    def category_tag(self, category: str):
+        """Pass-1 label for a lowercased category string, or None. Memoized."""
+        memo = self.memo
+        if category in memo:
+            return memo[category]
+        label = memo[category] = self.category_pass.first(category)
+        return label
+
+    def content_tag(self, combined: str) -> str:
+        """Pass-2 label for lowercased "category answer" text, or "Other"."""
+        return self.content_pass.first(combined) or "Other"
+
+def read_taxonomy(path: str = TAXONOMY_PATH) -> tuple[dict, dict, int]:
+    """
+    (category_map, content_map, revision) from a taxonomy file. Each pass is
+    {section: [[label, pattern] or [label, pattern, "linear"], …]}, in
+    priority order. Raises ValueError on a malformed file.
+    """
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    if data.get("format") != TAXONOMY_FORMAT:
+        raise ValueError(f"unsupported taxonomy format {data.get('format')!r}")
+    maps = []
+    for key in ("category", "content"):
+        rules = {}
+        for section, entries in data[key].items():
+            for label, pattern, *flags in entries:
+                if label in rules or label == "Other":
+                    raise ValueError(f"{key} rule {label!r} ({section}) is a duplicate or reserved label")
+                rules[label] = linear(pattern) if "linear" in flags else pattern
+        maps.append(rules)
+    return maps[0], maps[1], data.get("revision")
+
+def _analysis_path(path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(path)), ".corpus_cache", "taxonomy_compiled.json")
+
+def load_taxonomy(path: str = TAXONOMY_PATH) -> Taxonomy:
+    """
+    Read and compile a taxonomy file. The patterns' parse-tree analysis is
+    cached on disk per rule fingerprint, so only the regexes are compiled
+    again on a restart or reload with unchanged rules.
+    """
+    category_map, content_map, revision = read_taxonomy(path)
+    fingerprint = rules_fingerprint(category_map, content_map)
+    cache, analysis = _analysis_path(path), None
+    try:
+        with open(cache) as fh:
+            saved = json.load(fh)
+        if saved.get("fingerprint") == fingerprint and saved.get("format") == ANALYSIS_FORMAT:
+            analysis = {p: (set(lits) if lits is not None else None, risk)
+                        for p, (lits, risk) in saved["rules"].items()}
+    except Exception:
+        pass
+    taxonomy = Taxonomy(category_map, content_map, revision, analysis)
+    if analysis is None:
+        rules = {**taxonomy.category_pass.analysis, **taxonomy.content_pass.analysis}
+        try:
+            os.makedirs(os.path.dirname(cache), exist_ok=True)
+            with open(cache + ".tmp", "w") as fh:
+                json.dump({"fingerprint": fingerprint, "format": ANALYSIS_FORMAT,
+                           "rules": {p: [sorted(lits) if lits is not None else None, risk]
+                                     for p, (lits, risk) in rules.items()}}, fh)
+            os.replace(cache + ".tmp", cache)
+        except Exception:
+            pass
+    return taxonomy
+
+def _install(taxonomy: Taxonomy):
+    """Make taxonomy current: one reference swap, then the module aliases."""
+    global TAXONOMY, CATEGORY_MAP, CONTENT_MAP, ALL_TAGS, RULES_FINGERPRINT
+    global MASK_WORDS, MASK_COLUMNS, CATEGORY_PASS, CONTENT_PASS
+    TAXONOMY          = taxonomy
+    CATEGORY_MAP      = taxonomy.category_map
+    CONTENT_MAP       = taxonomy.content_map
+    ALL_TAGS          = taxonomy.all_tags
+    RULES_FINGERPRINT = taxonomy.fingerprint
+    MASK_WORDS        = taxonomy.mask_words
+    MASK_COLUMNS      = taxonomy.mask_columns
+    CATEGORY_PASS     = taxonomy.category_pass
+    CONTENT_PASS      = taxonomy.content_pass
+
+_RELOAD_LOCK = threading.RLock()
+
+def taxonomy() -> Taxonomy:
+    """The current taxonomy. Read it once per job for a consistent rule set."""
+    return TAXONOMY
+
+@contextmanager
+def pinned_taxonomy():
+    """Hold off reloads for the block (e.g. tagging and stamping a cache)."""
+    with _RELOAD_LOCK:
+        yield TAXONOMY
+
+def reload_taxonomy(path: str = None, force: bool = False) -> bool:
+    """
+    Swap in the taxonomy file's rules if the file changed since it was last
+    read. Cheap (one stat) when it has not. A file that fails to load or
+    compile leaves the current rules in place with a warning; a reload
+    requested while a pinned job runs is skipped until the next call.
+    True when the rules changed.
+    """
+    global _loaded_from
+    path = path or TAXONOMY_PATH
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    stamp = (path, st.st_mtime_ns, st.st_size)
+    if stamp == _loaded_from and not force:
+        return False
+    if not _RELOAD_LOCK.acquire(blocking=False):
+        return False
+    try:
+        if stamp == _loaded_from and not force:
+            return False
+        try:
+            new = load_taxonomy(path)
+        except Exception as e:
+            warnings.warn(f"tag taxonomy {path} not reloaded: {e}", RuntimeWarning)
+            _loaded_from = stamp   # retry once the file changes again
+            return False
+        _loaded_from = stamp
+        if new.fingerprint == TAXONOMY.fingerprint:
+            return False
+        _install(new)
+        return True
+    finally:
+        _RELOAD_LOCK.release()
+
+_stat        = os.stat(TAXONOMY_PATH)
+_loaded_from = (TAXONOMY_PATH, _stat.st_mtime_ns, _stat.st_size)   # what TAXONOMY was read from
+_install(load_taxonomy())
+
+def category_tag(category: str):
+    """Pass-1 label for a lowercased category string, or None. Memoized."""
+    return TAXONOMY.category_tag(category)
+
+def content_tag(combined: str) -> str:
+    """Pass-2 label for lowercased "category answer" text, or "Other"."""
+    return TAXONOMY.content_tag(combined)
+
+def reference_tag(category, answer) -> str:
+    """The original rule-by-rule engine, kept as the yardstick for verify()."""
+    tax      = TAXONOMY
+    category = str(category).lower()
+    combined = f"{category} {str(answer).lower()}"
+    for label, pattern in tax.category_map.items():
+        if re.search(pattern, category):
+            return label
+    for label, pattern in tax.content_map.items():
+        if re.search(pattern, combined):
+            return label
+    return "Other"
+
+def identify_universal_cat(row):
+    tax = TAXONOMY
+    category = str(row.get('category', '')).lower()
+    clue_text = str(row.get('answer', '')).lower()
+
+    # Pass 1: category string only
+    label = tax.category_tag(category)
+    if label is not None:
+        return label
+
+    # Pass 2: combined category + clue content
+    return tax.content_tag(f"{category} {clue_text}")
+
+# ─── Bulk tagging ─────────────────────────────────────────────────────────────
+
+def tag_clues(categories, answers, tax: Taxonomy = None) -> list:
+    """
+    identify_universal_cat() for parallel category / answer sequences, under
+    the current taxonomy or tax (e.g. a draft one).
+    """
+    tax, tags = tax or TAXONOMY, []
+    for category, answer in zip(categories, answers):
+        category = str(category).lower()
+        label = tax.category_tag(category)
+        tags.append(label if label is not None else tax.content_tag(f"{category} {str(answer).lower()}"))
+    return tags
+
+def tag_corpus(df, timings: dict = None, tax: Taxonomy = None) -> list:
+    """
+    Tag every row of a corpus DataFrame, in row order — the same result as
+    identify_universal_cat() on each row. A categorical category column is
+    matched once per category; rows whose category misses pass 1 (missing
+    categories included) are tagged by the content pass. If a timings dict
+    is given, each pass's seconds and input count are recorded in it. tax
+    defaults to the current taxonomy.
+    """
+    tax      = tax or TAXONOMY
+    category = df["category"]
+    if not isinstance(category.dtype, pd.CategoricalDtype):
+        category = category.astype("category")
+
+    t0 = time.perf_counter()
+    # a missing category has code -1, which picks the trailing "nan" (str(NaN))
+    cats  = [str(c).lower() for c in category.cat.categories] + ["nan"]
+    first = [tax.category_tag(c) for c in cats]
+    codes = np.asarray(category.cat.codes).tolist()
+    tags  = [first[c] for c in codes]
+
+    t1 = time.perf_counter()
+    answers = df["answer"].tolist()
+    misses  = [i for i, t in enumerate(tags) if t is None]
+    for i in misses:
+        tags[i] = tax.content_tag(f"{cats[codes[i]]} {str(answers[i]).lower()}")
+    if timings is not None:
+        timings.update(pass1_s=t1 - t0, pass1_inputs=len(cats),
+                       pass2_s=time.perf_counter() - t1, pass2_inputs=len(misses))
+    return tags
+
+def taxonomy_spec(tax: Taxonomy = None) -> tuple:
+    """The picklable rules of tax (default: the current taxonomy), for adopt_taxonomy()."""
+    tax = tax or TAXONOMY
+    return tax.category_map, tax.content_map, tax.revision, tax.fingerprint
+
+def adopt_taxonomy(spec: tuple) -> Taxonomy:
+    """
+    In a pool worker, make the submitting process's taxonomy (a
+    taxonomy_spec()) current. A forked worker already has it; a spawn or
+    forkserver one read tag_taxonomy.json on import, which may have changed
+    since, and compiles the shipped maps instead (once per worker).
+    """
+    category_map, content_map, revision, fingerprint = spec
+    with _RELOAD_LOCK:
+        if TAXONOMY.fingerprint != fingerprint:
+            _install(Taxonomy(category_map, content_map, revision))
+        return TAXONOMY
+
+def _tag_shard(shard: tuple) -> list:
+    spec, categories, answers = shard
+    return tag_clues(categories, answers, adopt_taxonomy(spec))
+
+def tag_clues_parallel(categories, answers, workers=None) -> list:
+    """
+    tag_clues() over a process pool: contiguous row-range shards, results
+    reassembled in row order. workers=1 (or a small input) tags serially.
+    """
+    categories, answers = list(categories), list(answers)
+    tax     = TAXONOMY
+    workers = workers or os.cpu_count() or 1
+    shards  = min(workers, len(categories) // PARALLEL_MIN_ROWS)
+    if shards > 1:
+        # every shard carries the rules, so workers tag with this taxonomy
+        # whatever the start method or a reload in between
+        spec   = taxonomy_spec(tax)
+        step   = -(-len(categories) // shards)
+        ranges = [(spec, categories[i:i + step], answers[i:i + step])
+                  for i in range(0, len(categories), step)]
+        try:
+            with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+                return [tag for part in pool.map(_tag_shard, ranges) for tag in part]
+        except Exception:
+            pass
+    return tag_clues(categories, answers, tax)
+
+def tag_corpus_parallel(df, workers=None) -> list:
+    """tag_corpus() over a process pool; same result, in row order."""
+    workers = workers or os.cpu_count() or 1
+    if workers < 2 or len(df) < 2 * PARALLEL_MIN_ROWS:
+        return tag_corpus(df)
+    return tag_clues_parallel(df["category"].tolist(), df["answer"].tolist(), workers)
+
+# ─── Multi-label masks ────────────────────────────────────────────────────────
+
+def _split_words(bits: list, words: int) -> np.ndarray:
+    """Python-int bitsets → (n, words) uint64."""
+    out = np.zeros((len(bits), words), dtype=np.uint64)
+    for w in range(words):
+        out[:, w] = [(b >> (64 * w)) & 0xFFFFFFFFFFFFFFFF for b in bits]
+    return out
+
+def tag_masks(df) -> np.ndarray:
+    """
+    (len(df), MASK_WORDS) uint64 array: every label whose category rule
+    matches the category or whose content rule matches category + answer.
+    Always includes the row's first-match tag ("Other" only when nothing
+    matched).
+    """
+    tax, tag_bit = TAXONOMY, TAXONOMY.tag_bit
+    category = df["category"]
+    if not isinstance(category.dtype, pd.CategoricalDtype):
+        category = category.astype("category")
+    cats  = [str(c).lower() for c in category.cat.categories] + ["nan"]   # code -1 → "nan"
+    codes = np.asarray(category.cat.codes).tolist()
+
+    cat_bits = []
+    for c in cats:
+        bits = 0
+        for label in tax.category_pass.all(c):
+            bits |= tag_bit[label]
+        cat_bits.append(bits)
+
+    row_bits = []
+    for c, answer in zip(codes, df["answer"].tolist()):
+        bits = cat_bits[c]
+        for label in tax.content_pass.all(f"{cats[c]} {str(answer).lower()}"):
+            bits |= tag_bit[label]
+        row_bits.append(bits or tag_bit["Other"])
+    return _split_words(row_bits, tax.mask_words)
+
+def mask_of(tags) -> list:
+    """The MASK_WORDS words with the bits of tags set."""
+    tax, bits = TAXONOMY, 0
+    for tag in tags:
+        bits |= tax.tag_bit[tag]
+    return [(bits >> (64 * w)) & 0xFFFFFFFFFFFFFFFF for w in range(tax.mask_words)]
+
+def rows_with_tags(df, tags, match: str = "any") -> np.ndarray:
+    """Boolean array: rows touching any (or, match="all", every) tag in tags."""
+    want = mask_of(tags)
+    out  = np.zeros(len(df), dtype=bool) if match == "any" else np.ones(len(df), dtype=bool)
+    for word, col in zip(want, TAXONOMY.mask_columns):
+        if not word:
+            continue
+        hit = np.asarray(df[col]) & np.uint64(word)
+        if match == "any":
+            out |= hit != 0
+        else:
+            out &= hit == np.uint64(word)
+    return out
+
+def tags_in_mask(row) -> list:
+    """Labels set in one clue's mask columns, in ALL_TAGS order."""
+    tax, bits = TAXONOMY, 0
+    for w, col in enumerate(tax.mask_columns):
+        bits |= int(row[col]) << (64 * w)
+    return [tag for tag, bit in tax.tag_bit.items() if bits & bit]
+
+# ─── Incremental re-tagging ───────────────────────────────────────────────────
+
+class _PassDiff:
+    """
+    Old → new winner of one pass, evaluating as few new rules as possible.
+    A rule whose linear flag flipped counts as edited.
+    """
+
+    def __init__(self, old_map: dict, new_map: dict, new_pass: TagPass):
+        self.old_labels = list(old_map)
+        self.position   = {label: i for i, label in enumerate(old_map)}
+        self.new_pass   = new_pass
+        old_items, new_items = list(old_map.items()), list(new_map.items())
+        edited = lambda a, b: a[0] != b[0] or not same_rule(a[1], b[1])
+        if list(old_map) == list(new_map):
+            self.changed = {i for i, (a, b) in enumerate(zip(old_items, new_items)) if edited(a, b)}
+            self.prefix  = None
+            # a handful of edited rules is cheaper to run directly than to prefilter
+            self.probe   = TagPass({self.old_labels[i]: new_map[self.old_labels[i]]
+                                    for i in sorted(self.changed)}, prefilter=len(self.changed) > 8)
+        else:
+            self.changed = None
+            self.prefix  = next((i for i, (a, b) in enumerate(zip(old_items, new_items)) if edited(a, b)),
+                                min(len(old_items), len(new_items)))
+
+    def winner(self, old_label, text: str):
+        """New first-match label (or None) given text's old winner (or None)."""
+        j = len(self.old_labels) if old_label is None else self.position[old_label]
+        if self.changed is None:
+            return old_label if j < self.prefix else self.new_pass.first(text)
+        if not self.changed:
+            return old_label
+        hit = self.probe.first(text)   # first edited rule that matches now
+        if hit is not None and self.position[hit] <= j:
+            return hit
+        if j in self.changed:          # the old winner was edited and no longer matches
+            return self.new_pass.first(text)
+        return old_label
+
+def retag(df, old_category_map: dict, old_content_map: dict) -> list:
+    """
+    New tags for a corpus frame whose "tag" column was computed with the old
+    maps; identical to tag_corpus(df) under the current maps.
+    """
+    tax      = TAXONOMY
+    category = df["category"]
+    if not isinstance(category.dtype, pd.CategoricalDtype):
+        category = category.astype("category")
+    cats  = [str(c).lower() for c in category.cat.categories] + ["nan"]   # code -1 → "nan"
+    codes = np.asarray(category.cat.codes).tolist()
+
+    # pass 1 per distinct category: the old winner, then the new one
+    if list(old_category_map) == list(tax.category_map) and all(
+            same_rule(old_category_map[label], pattern) for label, pattern in tax.category_map.items()):
+        old_first = new_first = [tax.category_tag(c) for c in cats]
+    else:
+        old_pass  = TagPass(old_category_map, prefilter=True)
+        old_first = [old_pass.first(c) for c in cats]
+        diff1     = _PassDiff(old_category_map, tax.category_map, tax.category_pass)
+        new_first = [diff1.winner(o, c) for o, c in zip(old_first, cats)]
+
+    diff2   = _PassDiff(old_content_map, tax.content_map, tax.content_pass)
+    answers = df["answer"].tolist()
+    old     = df["tag"].astype(object).tolist()
+    tags    = []
+    for i, c in enumerate(codes):
+        label = new_first[c]
+        if label is None:
+            combined = f"{cats[c]} {str(answers[i]).lower()}"
+            if old_first[c] is not None or (old[i] != "Other" and old[i] not in diff2.position):
+                label = tax.content_tag(combined)   # old tag came from pass 1: no content winner known
+            else:
+                label = diff2.winner(None if old[i] == "Other" else old[i], combined) or "Other"
+        tags.append(label)
+    return tags
+
+# ─── Verification ─────────────────────────────────────────────────────────────
+
+def verify(df) -> list:
+    """
+    Compare tag_corpus() with reference_tag() on every row of df.
+    Returns [(row, category, answer, engine_tag, reference_tag)] mismatches.
+    """
+    tags = tag_corpus(df)
+    mismatches = []
+    for i, (category, answer) in enumerate(zip(df["category"].tolist(), df["answer"].tolist())):
+        expected = reference_tag(category, answer)
+        if tags[i] != expected:
+            mismatches.append((i, category, answer, tags[i], expected))
+    return mismatches
+
+# ─── Benchmark / golden snapshot ──────────────────────────────────────────────
+
+GOLDEN_PATH     = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tag_golden.jsonl")
+GOLDEN_ID_CHARS = 16   # clue-id prefix kept in the snapshot (64 bits: no collisions at this size)
+REFERENCE_CLUES = 4_000  # evenly spaced clues timed through reference_tag() as the speed yardstick
+
+def benchmark(df, workers: int = 1) -> tuple[list, dict]:
+    """
+    Tag df from a cold cache; returns (tags, stats) with clues/sec and, for a
+    serial run, per-pass timings. workers > 1 uses tag_corpus_parallel().
+    """
+    TAXONOMY.memo.clear()
+    stats = {"workers": workers}
+    t0    = time.perf_counter()
+    tags  = tag_corpus(df, timings=stats) if workers == 1 else tag_corpus_parallel(df, workers)
+    stats["seconds"]       = time.perf_counter() - t0
+    stats["clues"]         = len(tags)
+    stats["clues_per_sec"] = len(tags) / stats["seconds"] if stats["seconds"] else 0.0
+    return tags, stats
+
+def reference_speed(df, clues: int = REFERENCE_CLUES) -> float:
+    """reference_tag() clues/sec over an evenly spaced sample of df, on this machine, now."""
+    step       = max(1, len(df) // clues)
+    categories = df["category"].tolist()[::step]
+    answers    = df["answer"].tolist()[::step]
+    t0 = time.perf_counter()
+    for category, answer in zip(categories, answers):
+        reference_tag(category, answer)
+    seconds = time.perf_counter() - t0
+    return len(categories) / seconds if seconds else 0.0
+
+def read_golden(path: str = GOLDEN_PATH) -> dict:
+    """
+    {"rules": fingerprint, "clues_per_sec": float, "speedup": float,
+    "tags": {clue_id prefix: tag}} or {}.
+    """
+    try:
+        with open(path, encoding="utf-8") as fh:
+            golden = json.loads(fh.readline())
+            golden["tags"] = dict(json.loads(line) for line in fh)
+    except Exception:
+        return {}
+    return golden
+
+def write_golden(clue_ids, tags, clues_per_sec: float, speedup: float, path: str = GOLDEN_PATH):
+    """
+    Snapshot tag per clue id as JSON lines: a header line, then one
+    ["clue_id prefix", "tag"] line per clue sorted by id, kept uncompressed
+    so a clue that moved tag shows up as one changed line in a diff.
+    """
+    header = {
+        "rules":         TAXONOMY.fingerprint,
+        "clues_per_sec": round(clues_per_sec),
+        "speedup":       round(speedup, 2),
+    }
+    by_id = {cid[:GOLDEN_ID_CHARS]: tag for cid, tag in zip(clue_ids, tags)}
+    with open(path + ".tmp", "w", encoding="utf-8", newline="\n") as fh:
+        fh.write(json.dumps(header) + "\n")
+        for cid in sorted(by_id):
+            fh.write(json.dumps([cid, by_id[cid]]) + "\n")
+    os.replace(path + ".tmp", path)
+
+def diff_golden(golden: dict, clue_ids, tags) -> dict:
+    """{"moved": Counter-like {(old, new): n}, "new": n, "missing": n} against a snapshot."""
+    expected = golden.get("tags", {})
+    current  = {cid[:GOLDEN_ID_CHARS]: tag for cid, tag in zip(clue_ids, tags)}
+    moved = {}
+    for cid, tag in current.items():
+        old = expected.get(cid)
+        if old is not None and old != tag:
+            moved[(old, tag)] = moved.get((old, tag), 0) + 1
+    return {
+        "moved":   moved,
+        "new":     sum(cid not in expected for cid in current),
+        "missing": sum(cid not in current for cid in expected),
+    }
+
+# ─── Profiling ────────────────────────────────────────────────────────────────
+
+PROFILE_SORTS = ("time", "evaluations", "hits", "label")
+
+def profile_corpus(df, sort: str = "time") -> list:
+    """
+    Tag df with per-rule accounting on. Returns one dict per (pass, label):
+    pass, label, evaluations, hits, hit_rate, total_ms, us_per_eval, sorted
+    by sort (one of PROFILE_SORTS; "label" keeps rule order).
+
+    Runs on a private copy of the current taxonomy (its pattern analysis
+    reused), so other callers' tagging never lands in the counts and the
+    shared passes and memo are left alone.
+    """
+    current  = TAXONOMY
+    analysis = {**current.category_pass.analysis, **current.content_pass.analysis}
+    tax      = Taxonomy(current.category_map, current.content_map, current.revision, analysis)
+    passes   = (("category", tax.category_pass), ("content", tax.content_pass))
+    for _, tag_pass in passes:
+        tag_pass.stats = {label: [0, 0, 0.0] for label in tag_pass.labels}
+    tag_corpus(df, tax=tax)   # fresh memo: pass 1 counted for every distinct category
+    collected = [(name, tag_pass.stats) for name, tag_pass in passes]
+
+    rows = []
+    for name, stats in collected:
+        for label, (evals, hits, seconds) in stats.items():
+            rows.append({
+                "pass":        name,
+                "label":       label,
+                "evaluations": evals,
+                "hits":        hits,
+                "hit_rate":    hits / evals if evals else 0.0,
+                "total_ms":    seconds * 1000,
+                "us_per_eval": seconds * 1e6 / evals if evals else 0.0,
+            })
+    if sort == "time":
+        rows.sort(key=lambda r: -r["total_ms"])
+    elif sort in ("evaluations", "hits"):
+        rows.sort(key=lambda r: -r[sort])
+    return rows
+
+def _print_profile(rows: list, limit: int = None):
+    total = sum(r["total_ms"] for r in rows) or 1.0
+    print(f"{'pass':<8} {'label':<28} {'evals':>8} {'hits':>7} {'hit%':>6} {'ms':>8} {'µs/eval':>8} {'share':>6}")
+    for r in rows[:limit]:
+        print(f"{r['pass']:<8} {r['label']:<28} {r['evaluations']:>8,} {r['hits']:>7,} "
+              f"{r['hit_rate']:>6.1%} {r['total_ms']:>8.1f} {r['us_per_eval']:>8.2f} {r['total_ms'] / total:>6.1%}")
+    never = [f"{r['pass']}:{r['label']}" for r in rows if r["evaluations"] and not r["hits"]]
+    if never:
+        print(f"never fired ({len(never)}): {', '.join(never)}")
+
+def _print_benchmark(stats: dict, tags: list):
+    print(f"{stats['clues']:,} clues in {stats['seconds']:.2f}s — {stats['clues_per_sec']:,.0f} clues/sec"
+          + (f" ({stats['workers']} workers)" if stats["workers"] > 1 else ""))
+    if "pass1_s" in stats:
+        print(f"  pass 1 (category): {stats['pass1_s']:.2f}s over {stats['pass1_inputs']:,} distinct categories")
+        print(f"  pass 2 (content):  {stats['pass2_s']:.2f}s over {stats['pass2_inputs']:,} clues")
+    counts = {}
+    for tag in tags:
+        counts[tag] = counts.get(tag, 0) + 1
+    print("tag distribution:")
+    for tag, n in sorted(counts.items(), key=lambda kv: -kv[1]):
+        print(f"  {tag:<28} {n:>7,}  {n / len(tags):6.1%}")
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    from corpus import load_corpus
+
+    parser = argparse.ArgumentParser(description="Tag engine tools.")
+    parser.add_argument("command", nargs="?", default="verify",
+                        choices=["verify", "lint", "bench", "profile"],
+                        help="verify: compare with the reference engine (default); "
+                             "lint: rule modes and backtracking risks; "
+                             "bench: throughput and tag distribution; "
+                             "profile: per-rule evaluations, hits and time")
+    parser.add_argument("--data-dir", default=".")
+    parser.add_argument("--check", action="store_true", help="bench: diff against the golden snapshot")
+    parser.add_argument("--update-golden", action="store_true", help="bench: rewrite the golden snapshot")
+    parser.add_argument("--max-slowdown", type=float, default=2.0,
+                        help="bench --check: fail if the speedup over reference_tag() "
+                             "drops below golden / this")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="bench: tagging processes (0 = one per core)")
+    parser.add_argument("--sort", choices=PROFILE_SORTS, default="time", help="profile: report order")
+    parser.add_argument("--limit", type=int, default=None, help="profile: rows to print")
+    args = parser.parse_args()
+
+    if args.command == "lint":
+        print(f"taxonomy {TAXONOMY_PATH}: revision {TAXONOMY.revision}, "
+              f"{len(CATEGORY_MAP)} + {len(CONTENT_MAP)} rules, fingerprint {RULES_FINGERPRINT}")
+        print(f"RE2 {'available' if re2 is not None else 'not installed'}")
+        for name, tag_pass in (("category", CATEGORY_PASS), ("content", CONTENT_PASS)):
+            problems = {}
+            for label, message in tag_pass.problems:
+                problems.setdefault(label, []).append(message)
+            for label in tag_pass.labels:
+                if tag_pass.modes[label] != "re" or label in problems:
+                    print(f"  {name:<8} {label:<28} [{tag_pass.modes[label]}] "
+                          f"{'; '.join(problems.get(label, []))}")
+        sys.exit(0)
+
+    corpus = load_corpus(args.data_dir)
+    if corpus is None:
+        sys.exit("No season files found.")
+
+    if args.command == "profile":
+        _print_profile(profile_corpus(corpus, sort=args.sort), args.limit)
+        sys.exit(0)
+
+    if args.command == "bench":
+        tags, stats = benchmark(corpus, args.workers or os.cpu_count() or 1)
+        _print_benchmark(stats, tags)
+        clue_ids = corpus["clue_id"].tolist()
+        if args.update_golden or args.check:
+            reference = reference_speed(corpus)
+            speedup   = stats["clues_per_sec"] / reference if reference else 0.0
+            print(f"reference_tag(): {reference:,.0f} clues/sec — engine speedup {speedup:.1f}x")
+        if args.update_golden:
+            write_golden(clue_ids, tags, stats["clues_per_sec"], speedup)
+            print(f"golden snapshot written: {GOLDEN_PATH}")
+        if args.check:
+            golden = read_golden()
+            if not golden:
+                sys.exit(f"no golden snapshot at {GOLDEN_PATH}; run bench --update-golden")
+            diff  = diff_golden(golden, clue_ids, tags)
+            drift = sum(diff["moved"].values())
+            print(f"golden check: {drift:,} clues moved tag, {diff['new']:,} new, "
+                  f"{diff['missing']:,} missing (golden rules {golden.get('rules')}, now {RULES_FINGERPRINT})")
+            for (old, new), n in sorted(diff["moved"].items(), key=lambda kv: -kv[1])[:20]:
+                print(f"  {n:>6,}  {old} → {new}")
+            floor = golden.get("speedup", 0) / args.max_slowdown
+            slow  = speedup < floor
+            print(f"speed check: {speedup:.1f}x reference_tag() "
+                  f"(golden {golden.get('speedup', 0):.1f}x, floor {floor:.1f}x)"
+                  + (" — TOO SLOW" if slow else ""))
+            sys.exit(1 if drift or slow else 0)
+        sys.exit(0)
+
+    t0 = time.perf_counter()
+    bad = verify(corpus)
+    print(f"{len(corpus):,} clues checked in {time.perf_counter() - t0:.1f}s: "
+          f"{len(bad):,} mismatches against the reference engine")
+    for i, category, answer, got, expected in bad[:20]:
+        print(f"  row {i}: {category!r} / {answer[:50]!r}: {got} != {expected}")
+    for name, tag_pass in (("category", CATEGORY_PASS), ("content", CONTENT_PASS)):
+        for label, (count, worst, sample) in tag_pass.overruns.items():
+            print(f"  over budget: {name} {label}: {count}x, worst {worst * 1000:.1f} ms on {sample[:60]!r}")
+    sys.exit(1 if bad else 0)
@@ -0,0 +1,300 @@
+"""
+tag_playground.py — Try a draft tag rule against the whole corpus.
+No Streamlit dependency: the app's rule playground (open it with ?debug=1)
+and `python tag_playground.py PATTERN` share this code.
+
+    from tag_playground import RulePlayground
+
+    lab = RulePlayground(load_corpus())
+    result = lab.test(r"\\bopera\\b", label="Opera", before="Classical Music")
+
+test() returns how many clues the pattern matches, a few sample clues, and
+how many clues would move from their current tag if the rule joined the
+taxonomy (at `before`, or replacing the pattern of an existing `label`).
+
+Trigram index:
+  Every clue is indexed by the trigrams of its lowercased "category answer"
+  text — exactly the text tag pass 2 sees; pass 1's category string is its
+  prefix. tag_engine.required_literals() gives literals one of which every
+  match of the pattern contains; a clue can only match if it holds every
+  trigram of one of them, so the candidates are the union over literals of
+  the intersection of their trigrams' posting lists. The real regex then
+  confirms each candidate, so counts are exact. Trigrams found in more than
+  STOP_FRACTION of clues (" th", "the", "ion", …) are not posted: they
+  barely narrow anything and would double the index. A pattern without a
+  usable literal (or one made only of such trigrams) is checked against
+  every clue.
+
+  The index (~30 MB for 160k clues) is saved to .corpus_cache/
+  trigram_index.npz, keyed by the frame's clue ids in row order, and
+  rebuilt only when they change. `python corpus.py ingest` refreshes it for
+  the full corpus; any other frame (a season subset) builds its own on
+  first use.
+
+Tag moves:
+  Only clues the draft matches, or clues currently carrying its label, can
+  change tag. Those are re-tagged with a throwaway tag_engine.Taxonomy that
+  includes the draft (reusing the current rules' analysis, so building it
+  costs one regex compile per rule) and compared with the tag column.
+"""
+
+import hashlib
+import os
+import re
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from corpus import CACHE_DIRNAME
+from tag_engine import Taxonomy, required_literals, tag_clues, tag_corpus, taxonomy
+
+TRIGRAM_VERSION = 1      # bump when the index layout changes
+STOP_FRACTION   = 0.05   # trigrams in more clues than this are not posted
+PASS_NAMES      = ("content", "category")
+
+def corpus_texts(df) -> tuple[list, list]:
+    """(texts, category_lengths): each row's lowercased "category answer" text,
+    as tag pass 2 builds it, and the length of its category prefix."""
+    category = df["category"]
+    if not isinstance(category.dtype, pd.CategoricalDtype):
+        category = category.astype("category")
+    cats  = [str(c).lower() for c in category.cat.categories] + ["nan"]   # code -1 → "nan"
+    codes = np.asarray(category.cat.codes).tolist()
+    texts = [f"{cats[c]} {str(a).lower()}" for c, a in zip(codes, df["answer"].tolist())]
+    return texts, [len(cats[c]) for c in codes]
+
+def _trigram_codes(codepoints: np.ndarray) -> np.ndarray:
+    """Code point array → one uint64 per trigram (three 21-bit code points)."""
+    cp = codepoints.astype(np.uint64)
+    return (cp[:-2] << np.uint64(42)) | (cp[1:-1] << np.uint64(21)) | cp[2:]
+
+def _codepoints(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+class TrigramIndex:
+    """
+    Posting lists of row numbers per trigram, as sorted numpy arrays.
+
+      index.candidates(literals)  → sorted rows that may contain one of the
+                                    literals, or None if they cannot narrow
+    """
+
+    def __init__(self, keys, starts, rows, stop, n_rows: int, key: str):
+        self.keys   = keys     # sorted trigram codes with postings
+        self.starts = starts   # keys[i]'s rows are rows[starts[i]:starts[i + 1]]
+        self.rows   = rows
+        self.stop   = stop     # sorted codes too common to post
+        self.n_rows = n_rows
+        self.key    = key
+
+    @classmethod
+    def build(cls, texts: list, key: str = ""):
+        cp    = _codepoints("\0".join(texts) + "\0")   # NUL separates rows
+        lens  = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        rows  = np.repeat(np.arange(len(texts), dtype=np.uint32), lens + 1)[:-2]
+        codes = _trigram_codes(cp)
+        real  = (cp[:-2] != 0) & (cp[1:-1] != 0) & (cp[2:] != 0)
+        codes, rows = codes[real], rows[real]
+
+        order = np.lexsort((rows, codes))
+        codes, rows = codes[order], rows[order]
+        first = np.ones(len(codes), dtype=bool)
+        first[1:] = (codes[1:] != codes[:-1]) | (rows[1:] != rows[:-1])
+        codes, rows = codes[first], rows[first]
+
+        keys, starts, counts = np.unique(codes, return_index=True, return_counts=True)
+        common = counts > STOP_FRACTION * max(len(texts), 1)
+        posted = np.repeat(~common, counts)
+        starts = np.concatenate([[0], np.cumsum(counts[~common])]).astype(np.int64)
+        return cls(keys[~common], starts, rows[posted], keys[common], len(texts), key)
+
+    def _postings(self, code) -> np.ndarray:
+        """Rows holding trigram code; None if it is a stop trigram."""
+        i = np.searchsorted(self.keys, code)
+        if i < len(self.keys) and self.keys[i] == code:
+            return self.rows[self.starts[i]:self.starts[i + 1]]
+        j = np.searchsorted(self.stop, code)
+        if j < len(self.stop) and self.stop[j] == code:
+            return None
+        return self.rows[:0]   # trigram occurs nowhere
+
+    def candidates(self, literals):
+        if not literals:
+            return None
+        found = []
+        for literal in literals:
+            if len(literal) < 3:
+                return None
+            lists = [self._postings(c) for c in set(_trigram_codes(_codepoints(literal)).tolist())]
+            lists = sorted((p for p in lists if p is not None), key=len)
+            if not lists:
+                return None   # only stop trigrams: no narrowing
+            rows = lists[0]
+            for other in lists[1:]:
+                if not len(rows):
+                    break
+                rows = np.intersect1d(rows, other, assume_unique=True)
+            found.append(rows)
+        return np.unique(np.concatenate(found)) if len(found) > 1 else found[0]
+
+    def save(self, file):
+        np.savez(file, keys=self.keys, starts=self.starts, rows=self.rows, stop=self.stop,
+                 n_rows=np.int64(self.n_rows), key=np.array(self.key))
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path) as npz:
+            return cls(npz["keys"], npz["starts"], npz["rows"], npz["stop"],
+                       int(npz["n_rows"]), str(npz["key"]))
+
+def _frame_key(df) -> str:
+    ids = "\n".join(df["clue_id"].tolist()) if "clue_id" in df.columns else str(len(df))
+    return hashlib.sha256(f"{TRIGRAM_VERSION} {STOP_FRACTION}\n{ids}".encode()).hexdigest()[:16]
+
+def open_trigram_index(df, data_dir: str = ".", texts: list = None) -> TrigramIndex:
+    """The saved index if it was built over df's clues in this order, else a
+    fresh one (saved for next time when the cache folder is writable)."""
+    key  = _frame_key(df)
+    path = os.path.join(data_dir, CACHE_DIRNAME, "trigram_index.npz")
+    try:
+        index = TrigramIndex.load(path)
+        if index.key == key:
+            return index
+    except Exception:
+        pass
+    index = TrigramIndex.build(texts if texts is not None else corpus_texts(df)[0], key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "wb") as fh:
+            index.save(fh)
+        os.replace(path + ".tmp", path)
+    except Exception:
+        pass
+    return index
+
+# ─── Playground ───────────────────────────────────────────────────────────────
+
+class RulePlayground:
+    """A corpus frame, its trigram index and its current tags, ready for test()."""
+
+    def __init__(self, df, data_dir: str = "."):
+        self.df = df
+        self.texts, self.cat_lens = corpus_texts(df)
+        self.index = open_trigram_index(df, data_dir, self.texts)
+        self.tags  = df["tag"].astype(object).tolist() if "tag" in df.columns else tag_corpus(df)
+
+    def _draft_taxonomy(self, pattern: str, pass_name: str, label: str, before) -> Taxonomy:
+        current = taxonomy()
+        maps = {"category": dict(current.category_map), "content": dict(current.content_map)}
+        rules = maps[pass_name]
+        if label not in rules and before in rules:
+            items = list(rules.items())
+            at = [name for name, _ in items].index(before)
+            rules = dict(items[:at] + [(label, pattern)] + items[at:])
+        else:
+            rules[label] = pattern   # replaces an existing rule in place, or appends
+        maps[pass_name] = rules
+        analysis = {**current.category_pass.analysis, **current.content_pass.analysis}
+        return Taxonomy(maps["category"], maps["content"], analysis=analysis)
+
+    def test(self, pattern: str, pass_name: str = "content", label: str = "Draft",
+             before: str = None, samples: int = 10, seed: int = 0) -> dict:
+        """
+        Match pattern against every clue's pass text (the category string
+        for pass_name="category"). Returns matches, candidates (clues the
+        regex ran on), seconds, samples [{category, answer, tag, new_tag}],
+        moved (clues whose tag would change with the rule added under label),
+        moves {(old, new): n} and problems (what rule validation says about
+        the draft, e.g. that the engine would disable it). Raises re.error
+        for a bad pattern and ValueError for a bad pass or label.
+        """
+        if pass_name not in PASS_NAMES:
+            raise ValueError(f"pass must be one of {PASS_NAMES}")
+        if not label or label == "Other":
+            raise ValueError("the draft rule needs a label other than 'Other'")
+        t0    = time.perf_counter()
+        regex = re.compile(pattern)
+        rows = self.index.candidates(required_literals(pattern))
+        rows = range(len(self.texts)) if rows is None else rows.tolist()
+
+        texts, cut = self.texts, self.cat_lens
+        if pass_name == "category":
+            matches = [i for i in rows if regex.search(texts[i][:cut[i]])]
+        else:
+            matches = [i for i in rows if regex.search(texts[i])]
+
+        # only clues the draft matches, or that carry its label now, can move
+        affected = sorted(set(matches) | {i for i, t in enumerate(self.tags) if t == label})
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")   # reported through "problems" instead
+            draft = self._draft_taxonomy(pattern, pass_name, label, before)
+        new_tags = tag_clues([texts[i][:cut[i]] for i in affected],
+                             [texts[i][cut[i] + 1:] for i in affected], tax=draft)
+        new_tag  = dict(zip(affected, new_tags))
+        moves = {}
+        for i, tag in new_tag.items():
+            if tag != self.tags[i]:
+                moves[(self.tags[i], tag)] = moves.get((self.tags[i], tag), 0) + 1
+
+        picked = np.random.default_rng(seed).permutation(len(matches))[:samples]
+        sample_rows = []
+        for i in sorted(matches[j] for j in picked):
+            row = self.df.iloc[i]
+            sample_rows.append({"category": row["category"], "answer": row["answer"],
+                                "tag": self.tags[i], "new_tag": new_tag[i]})
+        return {
+            "matches":    len(matches),
+            "candidates": len(rows),
+            "clues":      len(texts),
+            "seconds":    time.perf_counter() - t0,
+            "samples":    sample_rows,
+            "moved":      sum(moves.values()),
+            "moves":      moves,
+            "problems":   [msg for name, msg in (draft.category_pass.problems + draft.content_pass.problems)
+                           if name == label],
+        }
+
+def _print_result(result: dict, pattern: str):
+    print(f"{pattern!r}: {result['matches']:,} matching clues "
+          f"({result['candidates']:,} of {result['clues']:,} checked, {result['seconds'] * 1000:.0f} ms)")
+    for problem in result["problems"]:
+        print(f"  warning: {problem}")
+    print(f"{result['moved']:,} clues would change tag")
+    for (old, new), n in sorted(result["moves"].items(), key=lambda kv: -kv[1])[:15]:
+        print(f"  {n:>6,}  {old} → {new}")
+    if result["samples"]:
+        print("samples:")
+    for s in result["samples"]:
+        print(f"  [{s['tag']} → {s['new_tag']}] {s['category']}: {str(s['answer'])[:70]}")
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    from corpus import load_corpus
+
+    parser = argparse.ArgumentParser(description="Test a draft tag rule against the corpus.")
+    parser.add_argument("pattern", nargs="+", help="regex to test (several run against one index)")
+    parser.add_argument("--pass", dest="pass_name", choices=PASS_NAMES, default="content",
+                        help="content: category + clue text (default); category: category only")
+    parser.add_argument("--label", default="Draft", help="tag the rule assigns (an existing label edits that rule)")
+    parser.add_argument("--before", default=None, help="insert ahead of this label (default: last in its pass)")
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--data-dir", default=".")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.data_dir)
+    if corpus is None:
+        sys.exit("No season files found.")
+    t0  = time.perf_counter()
+    lab = RulePlayground(corpus, args.data_dir)
+    print(f"index ready in {time.perf_counter() - t0:.1f}s")
+    for pattern in args.pattern:
+        try:
+            result = lab.test(pattern, args.pass_name, args.label, args.before, args.samples)
+        except (re.error, ValueError) as e:
+            print(f"{pattern!r}: {e}")
+            continue
+        _print_result(result, pattern)
@@ -1,230 +1,22 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import random
-import glob
 import re
 import os
-import hashlib
 from drill_mode import render_drill_mode
+from corpus import ProgressiveCorpus, freeze_corpus
+from clue_store import ClueStore, open_clue_store
+from clue_stream import clue_id, season_files, season_label
+from tag_engine import identify_universal_cat, profile_corpus, reload_taxonomy, tags_in_mask, taxonomy
+from tag_playground import PASS_NAMES, RulePlayground
 
 st.set_page_config(page_title="Jeopardy! Pro Trainer", page_icon="🎓", layout="centered")
 
 # --- 1. STUDY TAG ENGINE ---
-# Tags are ordered from most specific to most general within each pass.
-# The first match wins, so specific tags (Shakespeare) must come before
-# their parent (Literature) to avoid being swallowed.
-
-# PASS 1: Match against the Jeopardy category string only.
-CATEGORY_MAP = {
-
-    # ── HISTORY ──────────────────────────────────────────────────────────────
-    "U.S. Presidents":          r"president|first lad(y|ies)|oval office|commander.in.chief",
-    "American Revolution":      r"revolutionary war|founding father|colonial america|declaration of independence|continental congress|patriot|loyalist|lexington|yorktown|saratoga",
-    "U.S. Civil War":           r"civil war|confedera|union army|gettysburg|lincoln.*war|reconstruction|emancipation",
-    "20th Century U.S. History":r"20th century.*u\.?s|american.*20th|new deal|great depression|vietnam.*war|watergate|cold war.*amer|korean war",
-    "American History":         r"american history|u\.?s\.? history|us history|westward|manifest destiny|lewis.*clark|gold rush|prohibition|suffrage|civil rights",
-    "Ancient History":          r"ancient (rome|greece|egypt|china|mesopotamia|persia|civiliz)|roman empire|greek empire|pharaoh|julius caesar|alexander the great|classical antiquity",
-    "Medieval History":         r"medieval|middle ages|feudal|crusade|knight|castle|magna carta|black death|plague|viking|norman|byzantine",
-    "European History":         r"european history|french revolution|napoleon|renaissance.*europe|hapsburg|bourbon|tudor|stuart|romanov|otto.*bismarck|weimar|austro",
-    "World War I":              r"world war i\b|world war 1\b|wwi\b|great war|western front|trench warfare|versailles|archduke|gallipoli",
-    "World War II":             r"world war ii\b|world war 2\b|wwii\b|nazi|holocaust|d.day|hiroshima|nagasaki|pearl harbor|normandy|allies.*axis",
-    "Cold War":                 r"cold war|soviet union|ussr|iron curtain|berlin wall|cuban missile|space race|khrushchev|reagan.*soviet|nato.*warsaw",
-    "World History":            r"world history|history of the world|ancient history|dynasty|empire|revolution|colonialism|imperialism|independence.*movement",
-    "African History":          r"african history|africa.*history|apartheid|nelson mandela|saharan|zulu|mali empire|songhai|slave trade.*africa",
-    "Asian History":            r"asian history|china.*history|japan.*history|mao|meiji|qing|ming dynasty|shogun|samurai|mughal|partition.*india",
-    "Latin American History":   r"latin american|south american history|mexican history|simón bolívar|conquistador|aztec|inca|maya|fidel castro|che guevara",
-
-    # ── GEOGRAPHY ────────────────────────────────────────────────────────────
-    "World Capitals":           r"world capital|capital cit|capital of (the|a )",
-    "U.S. States & Cities":     r"u\.?s\.? state|state capital|american cit|american state|u\.?s\.? cit|u\.?s\.? geography|50 state",
-    "African Geography":        r"africa.*geograph|african countr|african capital|african river|african mountain|sahara|sub.saharan",
-    "Asian Geography":          r"asia.*geograph|asian countr|asian capital|asian river|himalaya|gobi|yangtze|mekong|ganges",
-    "European Geography":       r"europe.*geograph|european countr|european capital|european river|alps|rhine|danube|thames",
-    "World Geography":          r"geograph|countr|nation|continent|river|mountain|lake|ocean|sea|island|peninsula|border|flag|map|latitude|longitude|hemisphere",
-
-    # ── SCIENCE ──────────────────────────────────────────────────────────────
-    "Astronomy & Space":        r"astronom|space|planet|star|comet|asteroid|galaxy|cosmos|nasa|telescope|solar system|nebula|orbit|black hole|constellation",
-    "Biology":                  r"biolog|species|evolution|dna|rna|gene|cell|ecosystem|taxonomy|mammal|vertebrate|invertebrate|microb|bacteri|virus|fungi",
-    "Chemistry":                r"chemistr|element|periodic table|compound|molecule|atom|bond|reaction|acid|base|polymer|isotope|valence|oxidat",
-    "Physics":                  r"physic|force|energy|gravity|quantum|relativity|newton|einstein|thermodynamic|electro|magnet|wave|particle|velocity|momentum",
-    "Earth Science":            r"earth science|geology|geograph.*science|volcano|earthquake|tectonic|mineral|rock|fossil|erosion|atmosphere|ocean.*science|meteorolog|climate science",
-    "Human Body & Medicine":    r"human body|anatomy|physiology|medicine|medical|disease|organ|muscle|bone|nerve|brain|heart|lung|blood|surgery|diagnosis|symptom|syndrome|doctor|physician",
-    "Science & Nature":         r"science|nature|natural world|wildlife|environment|ecology|animal|plant|botany|zoology|weather|climate|insect|reptile|amphibian",
-
-    # ── MATHEMATICS ──────────────────────────────────────────────────────────
-    "Mathematics":              r"math|algebra|geometry|calculus|equation|number theory|fraction|prime|theorem|statistic|probabilit|trigonometr|logarithm|matrix|vector",
-
-    # ── LITERATURE ───────────────────────────────────────────────────────────
-    "Shakespeare":              r"shakespeare|bard of avon|hamlet|macbeth|othello|king lear|midsummer|the tempest|romeo.*juliet|merchant of venice|much ado",
-    "American Literature":      r"american literature|american novel|american author|american poet|twain|hemingway|fitzgerald|steinbeck|faulkner|whitman|dickinson|poe|hawthorne|melville|updike|morrison",
-    "British Literature":       r"british literature|english literature|english novel|british author|dickens|austen|bronte|hardy|orwell|woolf|kipling|chaucer|milton|keats|shelley|byron|tennyson",
-    "Classic Literature":       r"classic(al)? literature|classic novel|great books|literary classic|homer|dante|cervantes|tolstoy|dostoevsky|kafka|proust|joyce|chekhov",
-    "Poetry":                   r"\bpoetry\b|\bpoem\b|\bpoets?\b|\bsonnet\b|\bode\b|\bverse\b|\blyric\b.*poet|laureate|pulitzer.*poem|epic poem",
-    "Children's Literature":    r"children.s (book|literature|story|fiction)|fairy tale|nursery rhyme|dr\. seuss|roald dahl|beatrix potter|grimm|andersen",
-    "Literature":               r"literature|novel|author|fiction|nonfiction|book|pulitzer|short stor|playwright|narrator|chapter|character.*novel",
-
-    # ── ARTS ─────────────────────────────────────────────────────────────────
-    "Classical Music":          r"classical music|composer|symphony|concerto|sonata|opera|orchestra|beethoven|mozart|bach|chopin|brahms|handel|vivaldi|schubert|liszt",
-    "Jazz & Blues":             r"jazz|blues|ragtime|bebop|swing music|louis armstrong|miles davis|john coltrane|duke ellington|billie holiday|muddy waters",
-    "Rock & Pop Music":         r"rock music|pop music|rock.*roll|punk|heavy metal|indie rock|alternative|billboard|grammy.*rock|grammy.*pop|rolling stones|beatles|elvis|bowie|michael jackson",
-    "Music":                    r"music|musician|singer|band|album|song|grammy|lyric|melody|chord|rhythm|record label|tour|concert",
-    "Painting & Sculpture":     r"painting|sculpture|painter|sculptor|canvas|fresco|mural|watercolor|oil paint|van gogh|picasso|monet|rembrandt|da vinci|michelangelo|rodin|warhol|dali",
-    "Architecture":             r"architect|architecture|building|skyscraper|cathedral|monument|landmark|bridge.*design|frank lloyd wright|modernist.*build|gothic.*cathedral",
-    "Art & Architecture":       r"\bart\b|artist|museum|gallery|exhibit|aesthetic|impressi|cubis|surreali|abstract|renaissance art|louvre|moma|metropolitan museum",
-    "Theater & Dance":          r"theater|theatre|broadway|musical|ballet|dance|choreograph|tony award|stage|opera.*stage|playwright|west end",
-    "Fashion & Design":         r"fashion|designer|couture|runway|vogue|haute|clothing|style.*fashion|chanel|dior|gucci|prada|armani",
-
-    # ── FILM & TELEVISION ────────────────────────────────────────────────────
-    "Oscar-Winning Films":      r"oscar|academy award|best picture|best director|best actor|best actress|best screenplay",
-    "Film Directors":           r"director|filmmaker|auteur|spielberg|scorsese|kubrick|hitchcock|coppola|tarantino|nolan|lynch",
-    "Animated Films & TV":      r"animated|cartoon|pixar|disney.*film|dreamworks|anime|studio ghibli|looney tunes|simpson|south park",
-    "TV Shows & Series":        r"television|tv show|sitcom|drama series|emmy|streaming|netflix.*show|hbo.*show|series finale|spin.?off",
-    "Film & TV":                r"movie|film|cinema|actor|actress|hollywood|box office|screen|blockbuster|sequel|franchise|cameo",
-
-    # ── SPORTS ───────────────────────────────────────────────────────────────
-    "American Football":        r"football|nfl|super bowl|quarterback|touchdown|gridiron|linebacker|wide receiver",
-    "Baseball":                 r"baseball|mlb|world series|pitcher|batting|home run|yankees|red sox|dodgers",
-    "Basketball":               r"basketball|nba|slam dunk|three.pointer|point guard|lebron|michael jordan|nba finals",
-    "Soccer / Football":        r"soccer|football.*world cup|fifa|premier league|la liga|bundesliga|serie a|champions league|goalkeeper|striker|penalty",
-    "Tennis":                   r"tennis|wimbledon|us open.*tennis|french open|australian open|grand slam.*tennis|serena|federer|nadal|djokovic",
-    "Golf":                     r"\bgolf\b|pga|masters.*golf|open championship|birdie|eagle|bogey|fairway|tiger woods",
-    "Winter Sports & Olympics":  r"winter olympic|ski|skiing|ice skating|figure skating|hockey|speed skate|luge|bobsled|snowboard",
-    "Olympics":                 r"olympic|olympiad|games.*athens|games.*beijing|games.*tokyo|gold medal|silver medal|bronze medal|olympic record",
-    "Sports":                   r"sport|athlete|champion|tournament|league|playoff|coach|stadium|trophy|record.*sport|hall of fame.*sport",
-
-    # ── FOOD & DRINK ─────────────────────────────────────────────────────────
-    "Wine & Spirits":           r"wine|champagne|whiskey|whisky|bourbon|vodka|gin|rum|brandy|tequila|vineyard|winery|sommelier|vintage.*wine",
-    "Food & Drink":             r"food|cuisine|cooking|chef|recipe|ingredient|beverage|dish|restaurant|gastron|flavor|spice|bread|cheese|dessert|cocktail|beer",
-
-    # ── LANGUAGE & WORDS ─────────────────────────────────────────────────────
-    "Foreign Languages":        r"french (word|phrase|language)|spanish (word|phrase|language)|german (word|phrase|language)|italian (word|phrase|language)|latin (word|phrase)|japanese (word|phrase)|translate|foreign language",
-    "Word Origins & Etymology": r"etymolog|word origin|root word|latin root|greek root|borrowed word|loanword",
-    "Wordplay & Puzzles":       r"anagram|palindrome|rhyme|homophone|pun|wordplay|crossword|riddle|acronym|abbreviation|portmanteau",
-    "Language & Words":         r"word|words|language|grammar|vocabulary|prefix|suffix|synonym|antonym|verb|noun|adjective|adverb|spelling|definition",
-
-    # ── SOCIAL SCIENCES ──────────────────────────────────────────────────────
-    "U.S. Government & Politics":r"u\.?s\.? government|u\.?s\.? politic|congress|senate|supreme court|constitution.*law|bill of rights|electoral|filibuster|amendment|political party",
-    "World Politics":           r"world politic|foreign policy|united nations|diplomacy|treaty|nato|european union|international relation|geopolitic|prime minister|chancellor|parliament",
-    "Economics":                r"econom|gdp|inflation|recession|stock market|supply.*demand|trade|tariff|fiscal|monetary|keynesian|capitalism|socialism|free market",
-    "Psychology":               r"psycholog|behavior|cognit|freud|jung|pavlov|therapy|mental health|personality|neuroscience|cognitive|emotion|motivation",
-    "Sociology & Anthropology": r"sociolog|anthropolog|culture|society|social.*structure|ethnograph|demograph|tribe|ritual|custom|norm.*social",
-
-    # ── RELIGION & PHILOSOPHY ────────────────────────────────────────────────
-    "The Bible & Christianity": r"bible|biblical|testament|gospel|jesus|christ|christian|church|pope|saint|apostle|psalm|proverb|genesis|exodus|revelation",
-    "World Religions":          r"religion|islam|muslim|quran|hinduism|buddhism|judaism|sikhism|taoism|confucian|shinto|mosque|synagogue|temple.*religion",
-    "Philosophy":               r"philosoph|ethics|logic|epistemology|metaphysics|plato|aristotle|socrates|kant|descartes|nietzsche|hegel|locke|hume|existential|utilitari",
-    "Religion & Philosophy":    r"theology|spiritual|faith|belief|meditation|soul|divine|sacred|myth.*religion",
-
-    # ── MYTHOLOGY ────────────────────────────────────────────────────────────
-    "Greek & Roman Mythology":  r"greek myth|roman myth|olympus|zeus|hera|apollo|athena|poseidon|ares|aphrodite|hermes|hercules|odysseus|achilles|jupiter|juno|mars|venus|mercury|neptune",
-    "Norse Mythology":          r"norse myth|viking myth|thor|odin|loki|freya|valhalla|asgard|ragnarok|yggdrasil",
-    "Mythology":                r"myth|mythology|legend|folklore|fable|deity|pantheon|demigod|hero.*myth|creature.*myth",
-
-    # ── TECHNOLOGY & COMPUTING ───────────────────────────────────────────────
-    "Computers & Technology":   r"computer|technology|software|hardware|internet|coding|programming|algorithm|artificial intelligence|ai\b|machine learning|cybersecurity|app|operating system|silicon valley",
-    "Inventions & Inventors":   r"invention|inventor|patent|thomas edison|nikola tesla|alexander graham bell|wright brothers|innovati|breakthrough|discover.*invent",
-
-    # ── MISCELLANEOUS ────────────────────────────────────────────────────────
-    "Animals & Wildlife":       r"animal|wildlife|mammal|bird|reptile|amphibian|fish|insect|spider|predator|prey|endangered|habitat|species",
-    "Plants & Botany":          r"plant|botany|flower|tree|shrub|herb|fungi|mushroom|garden|horticulture|flora|seed|petal|photosynthesis",
-    "Holidays & Traditions":    r"holiday|christmas|thanksgiving|halloween|easter|hanukkah|diwali|ramadan|tradition|celebration|festival|new year",
-    "Royalty & Nobility":       r"royal|royalty|king|queen|prince|princess|monarch|throne|crown|dynasty.*royal|nobility|duke|earl|count|baron|aristocra",
-    "Crime & Law":              r"crime|criminal|law|legal|court|trial|verdict|lawyer|attorney|judge|jury|detective|murder|theft|fraud|forensic",
-    "Awards & Honors":          r"award|prize|honor|pulitzer|nobel|emmy|grammy|oscar|tony|golden globe|laureat|recipient.*award",
-    "Potpourri":                r"potpourri|hodgepodge|miscellan|grab bag|mix|assorted",
-}
-
-# PASS 2: Broader content-based fallback (category + clue text combined).
-CONTENT_MAP = {
-    "U.S. Presidents":          r"\bpresident\b.*(\bU\.?S\.?\b|american|white house)|white house|potus|\b(lincoln|washington|jefferson|madison|monroe|adams|jackson|polk|taylor|fillmore|pierce|buchanan|grant|hayes|garfield|arthur|cleveland|harrison|mckinley|roosevelt|taft|wilson|harding|coolidge|hoover|truman|eisenhower|kennedy|johnson|nixon|ford|carter|reagan|bush|clinton|obama|trump|biden)\b",
-    "American Revolution":      r"revolutionary war|lexington.*concord|bunker hill|valley forge|continental army|thomas paine|common sense.*paine|boston tea party|stamp act",
-    "U.S. Civil War":           r"civil war|gettysburg|antietam|bull run|confedera|union.*army|ulysses.*grant|robert e\.? lee|stonewall jackson|emancipation proclamation|underground railroad",
-    "20th Century U.S. History":r"new deal|great depression|dust bowl|vietnam war|korean war|watergate|cuban missile|moon landing|martin luther king|civil rights movement|malcolm x|woodstock|women.s liberation",
-    "American History":         r"pilgrim|mayflower|manifest destiny|lewis.*clark|gold rush|transcontinental railroad|industrial revolution.*america|prohibition.*america|suffragette.*america",
-    "Ancient History":          r"roman empire|greek empire|ancient egypt|ancient china|mesopotamia|fertile crescent|julius caesar|cleopatra|alexander the great|trojan war|colosseum|parthenon|pyramids",
-    "Medieval History":         r"feudal|crusade|black death|magna carta|charlemagne|genghis khan|marco polo|joan of arc|hundred years|knight.*medieval|castle.*medieval",
-    "European History":         r"french revolution|napoleon|marie antoinette|waterloo|bismarck|otto.*germany|hapsburg|renaissance.*europe|protestant reformation|martin luther.*church",
-    "World War I":              r"world war.*one|world war i|archduke franz|western front|trench|gallipoli|armistice|treaty of versailles|woodrow wilson.*war",
-    "World War II":             r"world war.*two|world war ii|nazi|hitler|stalin|churchill|holocaust|auschwitz|d.day|pearl harbor|hiroshima|normandy|battle of britain",
-    "Cold War":                 r"soviet union|ussr|iron curtain|berlin wall|cuban missile crisis|nuclear.*standoff|arms race|mccarthyism|sputnik|space race.*soviet",
-    "World History":            r"colonialism|imperialism|independence movement|french revolution|industrial revolution|enlightenment|reformation|silk road",
-    "World Capitals":           r"capital (city|of)|seat of government",
-    "U.S. States & Cities":     r"\b(alabama|alaska|arizona|arkansas|california|colorado|connecticut|delaware|florida|georgia|hawaii|idaho|illinois|indiana|iowa|kansas|kentucky|louisiana|maine|maryland|massachusetts|michigan|minnesota|mississippi|missouri|montana|nebraska|nevada|new hampshire|new jersey|new mexico|new york|north carolina|north dakota|ohio|oklahoma|oregon|pennsylvania|rhode island|south carolina|south dakota|tennessee|texas|utah|vermont|virginia|washington|west virginia|wisconsin|wyoming)\b",
-    "World Geography":          r"\bcapital\b|mountain range|river delta|archipelago|strait|peninsula|equator|hemisphere",
-    "Astronomy & Space":        r"planet|star|galaxy|comet|asteroid|orbit|nasa|telescope|solar system|nebula|black hole|constellation|astronaut|spacecraft|supernova",
-    "Biology":                  r"dna|rna|evolution|species|gene|chromosome|cell.*biology|ecosystem|photosynthesis|mitosis|meiosis|protein|enzyme",
-    "Chemistry":                r"periodic table|chemical element|molecule|compound|atom|chemical bond|acid.*base|polymer|oxidation|reduction|isotope",
-    "Physics":                  r"force|gravity|quantum|relativity|thermodynamic|electromagnetism|wave.*particle|velocity|momentum|newton.*law|einstein.*theory",
-    "Earth Science":            r"volcano|earthquake|tectonic plate|mineral|rock.*geolog|fossil|erosion|atmosphere.*earth|ocean current|meteorolog",
-    "Human Body & Medicine":    r"organ|muscle|bone|nerve|brain|heart|lung|liver|kidney|blood|surgery|diagnosis|symptom|vaccine|antibiotic|cancer|diabetes",
-    "Science & Nature":         r"scientific|experiment|hypothesis|natural world|wildlife|habitat|predator|prey|food chain|climate change|biodiversity",
-    "Mathematics":              r"\bequation\b|\btheorem\b|prime number|pythagorean|fibonacci|calculus|integer|polynomial|derivative|integral",
-    "Shakespeare":              r"shakespeare|hamlet|macbeth|othello|falstaff|iago|prospero|oberon|titania|polonius|cordelia|desdemona|shylock|puck",
-    "American Literature":      r"\b(twain|hemingway|fitzgerald|steinbeck|faulkner|whitman|dickinson|thoreau|emerson|hawthorne|melville|poe|morrison|updike|roth|carver|vonnegut|salinger|kerouac)\b",
-    "British Literature":       r"\b(dickens|austen|bronte|hardy|orwell|woolf|kipling|chaucer|milton|keats|shelley|byron|tennyson|browning|eliot|swift|defoe|fielding|thackeray|forster|lawrence|greene|amis)\b",
-    "Classic Literature":       r"\b(homer|dante|cervantes|tolstoy|dostoevsky|kafka|proust|joyce|chekhov|turgenev|flaubert|balzac|hugo|zola|ibsen|strindberg)\b",
-    "Poetry":                   r"\bsonnet\b|\bode\b|\bpoem\b|\bpoet\b|\bverse\b|epic poem|haiku|laureate|iambic pentameter",
-    "Children's Literature":    r"fairy tale|nursery rhyme|dr\.? seuss|roald dahl|beatrix potter|brothers grimm|hans christian andersen|grimm.*tale",
-    "Literature":               r"\bnovel\b|\bfiction\b|\bnarrator\b|\bplot\b|\bchapter\b|\bcharacter.*book\b|literary|protagonist|antagonist",
-    "Classical Music":          r"\b(beethoven|mozart|bach|chopin|brahms|handel|vivaldi|schubert|liszt|haydn|tchaikovsky|debussy|ravel|mahler|strauss|verdi|puccini|wagner)\b",
-    "Jazz & Blues":             r"\b(armstrong|miles davis|coltrane|ellington|billie holiday|charlie parker|dizzy gillespie|thelonious monk|muddy waters|bb king|robert johnson)\b",
-    "Rock & Pop Music":         r"\b(beatles|rolling stones|led zeppelin|pink floyd|bowie|elvis|jimi hendrix|queen.*band|nirvana|radiohead|michael jackson|madonna|prince.*musician|u2|fleetwood mac)\b",
-    "Music":                    r"\bsong\b|\balbum\b|\bband\b|\bsinger\b|\blyric\b|\bmelody\b|\bchord\b|\brhythm\b|\bconcert\b|\btour\b.*music",
-    "Painting & Sculpture":     r"\b(van gogh|picasso|monet|rembrandt|da vinci|michelangelo|rodin|warhol|dali|renoir|matisse|cézanne|gauguin|degas|klimt|kandinsky|pollock|basquiat)\b",
-    "Architecture":             r"\b(frank lloyd wright|le corbusier|zaha hadid|mies van der rohe|gaudi|renzo piano)\b|skyscraper|cathedral|colosseum|parthenon|taj mahal",
-    "Art & Architecture":       r"\bpainting\b|\bsculpture\b|\bcanvas\b|\bmural\b|\bfresco\b|\bbaroque\b|\bimpressionism\b|\bcubism\b|\babstract art\b|louvre|moma",
-    "Theater & Dance":          r"broadway|musical theater|ballet|choreograph|tony award|west end|opera.*stage|mime|modern dance",
-    "Oscar-Winning Films":      r"academy award|best picture|best director|best actor|best actress",
-    "Film & TV":                r"\bfilm\b|\bmovie\b|\bdirector\b|\bactor\b|\bactress\b|\boscars?\b|\bcinema\b|\bscreenplay\b|\btelevision\b|\bsitcom\b|\bdrama.*series\b",
-    "American Football":        r"\bnfl\b|super bowl|quarterback|touchdown|gridiron|\b(patriots|cowboys|packers|steelers|49ers|chiefs|bears|giants|eagles)\b",
-    "Baseball":                 r"\bmlb\b|world series|pitcher|batting average|home run|\b(yankees|red sox|dodgers|cubs|giants|cardinals|braves)\b",
-    "Basketball":               r"\bnba\b|slam dunk|three.pointer|\b(lakers|celtics|bulls|spurs|warriors|heat|cavaliers)\b|lebron james|michael jordan",
-    "Soccer / Football":        r"\bfifa\b|premier league|la liga|bundesliga|champions league|world cup.*soccer|goal.*soccer|penalty kick",
-    "Tennis":                   r"wimbledon|us open.*tennis|french open|australian open|grand slam|serena williams|roger federer|rafael nadal|novak djokovic",
-    "Olympics":                 r"olympic games|gold medal|silver medal|bronze medal|olympic record|olympic champion",
-    "Sports":                   r"\btournament\b|\bleague\b|\bplayoff\b|\bchampionship\b|\bathlete\b|\bcoach\b|\bstadium\b|\btrophy\b|hall of fame",
-    "Wine & Spirits":           r"\bwine\b|\bchampagne\b|\bwhiskey\b|\bwhisky\b|\bbourbon\b|\bvodka\b|\bgin\b|\brum\b|\bbrandy\b|\btequila\b|\bwinery\b|\bvineyard\b",
-    "Food & Drink":             r"\brecipe\b|\bingredient\b|\bcuisine\b|\bflavor\b|\bbaked\b|\bgrilled\b|\bcocktail\b|\bbeer\b|\bchef\b|\brestaurant\b|\bdish\b",
-    "Foreign Languages":        r"french word|spanish word|german word|italian word|latin phrase|japanese word|translate|in (french|spanish|german|italian|latin|japanese)",
-    "Word Origins & Etymology":  r"etymology|word origin|root word|latin root|greek root|borrowed word",
-    "Wordplay & Puzzles":       r"anagram|palindrome|rhyme|homophone|portmanteau|acronym|wordplay|crossword",
-    "Language & Words":         r"\bgrammar\b|\bvocabulary\b|\bprefix\b|\bsuffix\b|\bsynonym\b|\bantonym\b|\bverb\b|\bnoun\b|\badjective\b|\bspelling\b",
-    "U.S. Government & Politics":r"congress|senate|supreme court|electoral college|filibuster|amendment.*constitution|bill of rights|political party.*us",
-    "World Politics":           r"united nations|nato|european union|diplomacy|treaty|prime minister|chancellor|parliament|geopolitic",
-    "Economics":                r"gdp|inflation|recession|stock market|supply.*demand|free trade|tariff|keynesian|capitalism|socialism",
-    "Psychology":               r"freud|jung|pavlov|skinner|cognitive.*psycholog|therapy|mental health|personality disorder|neuroscience",
-    "The Bible & Christianity":  r"\bbible\b|\bbiblical\b|\btestament\b|\bgospel\b|\bjesus\b|\bchrist\b|\bapostle\b|\bpsalm\b|\bproverb\b|\bgenesis\b|\bexodus\b",
-    "World Religions":          r"\bislam\b|\bmuslim\b|\bquran\b|\bhindu\b|\bbuddhis\b|\bjudaism\b|\bsikhism\b|\btaoism\b|\bmosque\b|\bsynagogue\b",
-    "Philosophy":               r"\b(plato|aristotle|socrates|kant|descartes|nietzsche|hegel|locke|hume|sartre|camus|wittgenstein|rousseau)\b|existential|utilitari|epistemolog",
-    "Greek & Roman Mythology":  r"\b(zeus|hera|apollo|athena|poseidon|ares|aphrodite|hermes|hercules|odysseus|achilles|perseus|medusa|minotaur|jupiter|juno|mars|venus|mercury|neptune|vulcan|diana|minerva)\b",
-    "Norse Mythology":          r"\b(thor|odin|loki|freya|valhalla|asgard|ragnarok|yggdrasil|frigg|tyr|baldur)\b",
-    "Mythology":                r"\bmyth\b|\bmythology\b|\blegend\b|\bfolklore\b|\bfable\b|\bdemigod\b|\bdeity\b|\bpantheon\b",
-    "Computers & Technology":   r"computer|software|hardware|internet|coding|programming|algorithm|artificial intelligence|\bai\b|machine learning|silicon valley|\bapp\b|\boperating system\b",
-    "Inventions & Inventors":   r"invention|inventor|patent|\b(edison|tesla|bell|wright brothers|gutenberg|galileo|newton|darwin|curie|pasteur)\b",
-    "Animals & Wildlife":       r"\b(lion|tiger|elephant|giraffe|whale|dolphin|eagle|shark|crocodile|gorilla|chimpanzee|penguin|polar bear|wolf|fox|deer|bear|rabbit|squirrel)\b",
-    "Royalty & Nobility":       r"\b(king|queen|prince|princess|monarch|emperor|empress|tsar|sultan|pharaoh)\b.*\b(of|the)\b|royal family|buckingham|versailles",
-    "Crime & Law":              r"\b(murder|theft|fraud|robbery|trial|verdict|jury|detective|prosecutor|defendant|felony|misdemeanor|forensic)\b",
-    "Holidays & Traditions":    r"\b(christmas|thanksgiving|halloween|easter|hanukkah|diwali|ramadan|passover|new year)\b",
-}
-
-ALL_TAGS = list(dict.fromkeys(list(CATEGORY_MAP.keys()) + list(CONTENT_MAP.keys()) + ["Other"]))
-
-def identify_universal_cat(row):
-    category = str(row.get('category', '')).lower()
-    clue_text = str(row.get('answer', '')).lower()
-    combined = f"{category} {clue_text}"
-
-    # Pass 1: category string only
-    for label, pattern in CATEGORY_MAP.items():
-        if re.search(pattern, category):
-            return label
-
-    # Pass 2: combined category + clue content
-    for label, pattern in CONTENT_MAP.items():
-        if re.search(pattern, combined):
-            return label
-
-    return "Other"
+# Matching lives in tag_engine.py (no Streamlit, so batch tools can tag the
+# corpus) and the rules in tag_taxonomy.json, reloaded between reruns (see
+# section 4); overrides and per-session caching are below.
 
 # --- 1b. CLUE TAG PERSISTENCE (Supabase) ---
 # Manual tag overrides are saved per-clue so the correct tag is always shown.
@@ -241,9 +33,18 @@ def _get_supabase():
         return None
 
 def _clue_id(row) -> str:
-    """Stable fingerprint for a clue: sha256 of category+answer+question."""
-    raw = f"{row.get('category','')}{row.get('answer','')}{row.get('question','')}"
-    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+    """Stable fingerprint for a clue: sha256 of category+answer+question.
+    Corpus rows carry it precomputed from the raw (pre-cleaning) text."""
+    if "clue_id" in row:
+        return row["clue_id"]
+    return clue_id(row.get('category',''), row.get('answer',''), row.get('question',''))
+
+def _clue_ids(frame, start: int = 0) -> list:
+    """_clue_id for every row from start on, read from the ingest-time
+    clue_id column rather than hashing row by row."""
+    if isinstance(frame, ClueStore):
+        return frame.clue_ids(start)
+    return frame["clue_id"].iloc[start:].tolist()
 
 def _fetch_tag_overrides(clue_ids: list) -> dict:
     """
@@ -332,27 +133,42 @@ def _save_game_stats(stats: dict, winnings: int):
 
 def _prime_tag_cache(pool_df):
     """
-    Called once after data loads. Batch-fetches saved tags for all clues
-    in the current filtered pool and stores them in session_state.
-    Subsequent lookups are pure dict reads — no DB calls during play.
+    Called on every run. Batch-fetches saved tags for clues not seen yet and
+    stores them in session_state. The corpus only ever grows by appending
+    rows (progressive loading), so after the first call only the newly
+    landed tail is fetched. Lookups during play are pure dict reads.
     """
-    if pool_df is None or "tag_cache" in st.session_state:
+    if pool_df is None:
+        return
+    done = st.session_state.get("tag_cache_rows", 0)
+    if "tag_cache" in st.session_state and done >= len(pool_df):
         return
-    clue_ids = [_clue_id(pool_df.iloc[i]) for i in range(len(pool_df))]
-    st.session_state.tag_cache = _fetch_tag_overrides(clue_ids)
+    if "tag_cache" not in st.session_state:
+        done = 0
+    clue_ids = _clue_ids(pool_df, start=done)
+    cache = st.session_state.get("tag_cache", {})
+    for cid, tag in _fetch_tag_overrides(clue_ids).items():
+        cache.setdefault(cid, tag)   # keep overrides made earlier this session
+    st.session_state.tag_cache = cache
+    st.session_state.tag_cache_rows = len(pool_df)
+    if isinstance(pool_df, ClueStore):
+        return   # low-memory backend: skip the per-session reverse map
     # Also store a mapping from clue_id → df index for quick reverse lookup
-    st.session_state.clue_id_map = {
-        _clue_id(pool_df.iloc[i]): i for i in range(len(pool_df))
-    }
+    id_map = st.session_state.get("clue_id_map", {})
+    id_map.update({cid: done + i for i, cid in enumerate(clue_ids)})
+    st.session_state.clue_id_map = id_map
 
 def get_tag_for_clue(row) -> str:
     """
-    Return the tag for a clue: DB override if saved, otherwise run engine.
+    Return the tag for a clue: DB override if saved, otherwise the tag
+    column computed once at load (engine fallback for rows without one).
     """
     cid = _clue_id(row)
     cache = st.session_state.get("tag_cache", {})
     if cid in cache:
         return cache[cid]
+    if "tag" in row:
+        return row["tag"]
     return identify_universal_cat(row)
 
 
@@ -446,29 +262,122 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- 4. DATA LOADING (SEASON CAPTURE) ---
-@st.cache_data
-def load_all_seasons():
-    files = glob.glob("*.tsv")
-    if not files:
-        return None
-    
-    all_chunks = []
-    for f in files:
-        try:
-            temp_df = pd.read_csv(f, sep='\t', low_memory=False)
-            s_match = re.search(r'\d+', f)
-            temp_df['season'] = s_match.group() if s_match else "??"
-            all_chunks.append(temp_df)
-        except:
-            continue
-            
-    if not all_chunks:
+@st.cache_resource(max_entries=4)
+def load_all_seasons(seasons=None, rounds=None, tag_rules=None):
+    """
+    One corpus per server process (per season/round selection), handed to
+    every session by reference (cache_data would unpickle a fresh copy on
+    every rerun). Each rerun reads it through a shallow copy, so writes and
+    column changes stay local (copy-on-write) instead of leaking into other
+    sessions. Parsing + the on-disk Parquet cache live in corpus.py.
+
+    Loading is progressive: the newest season is playable right away and the
+    rest are appended on a background thread. Read .df on every rerun.
+    The corpus is never shuffled; get_next samples row indexes with the
+    session's seeded RNG, taken in (season, row) order so a seed replays the
+    same clues however the corpus was loaded.
+    tag_rules (the taxonomy fingerprint) only keys the cache, so edited tag
+    rules get a corpus re-tagged with them.
+    """
+    return ProgressiveCorpus(first="newest", finalize=freeze_corpus,
+                             seasons=seasons, rounds=rounds).start()
+
+@st.cache_resource(max_entries=4)
+def load_clue_store(seasons=None, rounds=None, tag_rules=None):
+    """Low-memory backend: season files are memory-mapped and rows decoded on
+    demand, so no DataFrame is ever built. See clue_store.py."""
+    return open_clue_store(seasons=seasons, rounds=rounds)
+
+def _parse_numbers(spec: str):
+    """'39-41' → (39, 40, 41), '1,2' → (1, 2); blank → None (everything)."""
+    numbers = set()
+    for part in spec.replace(" ", "").split(","):
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            numbers.update(range(int(lo), int(hi) + 1))
+        elif part:
+            numbers.add(int(part))
+    return tuple(sorted(numbers)) or None
+
+# "pandas" (default) or "mmap" for instances too small to hold the DataFrame
+CORPUS_BACKEND = os.environ.get("TRIVIA_CORPUS_BACKEND", "pandas")
+# Default corpus subset, e.g. TRIVIA_SEASONS="39-41" TRIVIA_ROUNDS="3" on a
+# small instance. Each session can narrow/widen it from the sidebar. A
+# setting that does not parse or matches nothing falls back to the full
+# corpus with a sidebar warning rather than failing or loading nothing.
+CORPUS_WARNINGS = []
+
+def _env_numbers(name: str):
+    """_parse_numbers() of an environment setting; None (plus a warning) if malformed."""
+    try:
+        return _parse_numbers(os.environ.get(name, ""))
+    except ValueError:
+        CORPUS_WARNINGS.append(f"{name}={os.environ[name]} is not a list of numbers or "
+                               f"ranges (e.g. \"39-41\"); ignoring it.")
         return None
-    
-    df = pd.concat(all_chunks, ignore_index=True)
-    return df.dropna(subset=['answer', 'question']).sample(frac=1).reset_index(drop=True)
 
-df = load_all_seasons()
+CORPUS_SEASONS = _env_numbers("TRIVIA_SEASONS")
+CORPUS_ROUNDS  = _env_numbers("TRIVIA_ROUNDS")
+ROUND_NAMES    = {1: "Jeopardy!", 2: "Double Jeopardy!", 3: "Final Jeopardy!"}
+
+# Keep only seasons/rounds that exist
+_available = sorted(int(season_label(f)) for f in season_files() if season_label(f).isdigit())
+for _name, _env, _known, _what in (("TRIVIA_SEASONS", CORPUS_SEASONS, _available, "season"),
+                                   ("TRIVIA_ROUNDS", CORPUS_ROUNDS, list(ROUND_NAMES), "round")):
+    if _env and not set(_env) & set(_known):
+        CORPUS_WARNINGS.append(f"{_name}={os.environ[_name]} matches no {_what} here; loading every {_what}.")
+CORPUS_SEASONS = (tuple(s for s in CORPUS_SEASONS if s in _available) or None) if CORPUS_SEASONS else None
+CORPUS_ROUNDS  = (tuple(r for r in CORPUS_ROUNDS if r in ROUND_NAMES) or None) if CORPUS_ROUNDS else None
+
+def _reset_corpus_position():
+    """Row indexes (current clue, history) belong to the old corpus frame."""
+    st.session_state.clue_history = []
+    st.session_state.history_pos  = -1
+    st.session_state.initialized  = False
+    for k in ("tag_cache", "tag_cache_rows", "clue_id_map"):
+        st.session_state.pop(k, None)
+
+if 'corpus_selection' not in st.session_state:
+    st.session_state.corpus_selection = (CORPUS_SEASONS, CORPUS_ROUNDS)
+_sel_seasons, _sel_rounds = st.session_state.corpus_selection
+
+# An edited tag_taxonomy.json is swapped in here without a restart. Corpora
+# tagged with the old rules are dropped; the reload re-tags the cached
+# season parts incrementally, and every other cache stays warm.
+if reload_taxonomy():
+    load_all_seasons.clear()
+    load_clue_store.clear()
+TAXONOMY     = taxonomy()
+ALL_TAGS     = TAXONOMY.all_tags
+MASK_COLUMNS = TAXONOMY.mask_columns
+if st.session_state.get("corpus_rules", TAXONOMY.fingerprint) != TAXONOMY.fingerprint:
+    _reset_corpus_position()
+st.session_state.corpus_rules = TAXONOMY.fingerprint
+
+if CORPUS_BACKEND == "mmap":
+    corpus_loader = None
+    df = load_clue_store(_sel_seasons, _sel_rounds, TAXONOMY.fingerprint)
+else:
+    corpus_loader = load_all_seasons(_sel_seasons, _sel_rounds, TAXONOMY.fingerprint)
+    if corpus_loader.error is not None:
+        # keep serving what loaded, but drop the failed loader so the next
+        # rerun starts a fresh one instead of staying partial forever
+        load_all_seasons.clear(_sel_seasons, _sel_rounds, TAXONOMY.fingerprint)
+    # a retried or evicted loader may lay the rows out differently (a
+    # progressive load puts its first season ahead): old positions are void
+    if st.session_state.get("corpus_loader_id", corpus_loader.id) != corpus_loader.id:
+        _reset_corpus_position()
+    st.session_state.corpus_loader_id = corpus_loader.id
+    # the frame is shared by every session; this rerun gets its own column
+    # set, and copy-on-write keeps any write to it local
+    df = corpus_loader.df
+    if df is not None:
+        df = df.copy(deep=False)
+
+def _clue_row(idx):
+    """Row idx of the corpus, whichever backend is active."""
+    return df.row(idx) if isinstance(df, ClueStore) else df.iloc[idx]
+
 _prime_tag_cache(df)
 
 # --- 5. STATE MANAGEMENT ---
@@ -507,6 +416,14 @@ else:
         if k not in st.session_state.settings:
             st.session_state.settings[k] = v
 
+if 'rng' not in st.session_state:
+    # Every random draw in a session comes from one seeded RNG, so a session
+    # can be replayed for a bug report or benchmark by opening the app with
+    # ?seed=N (the current seed is shown at the bottom of the sidebar).
+    _seed = st.query_params.get("seed", "")
+    st.session_state.seed = int(_seed) if _seed.isdigit() else random.randrange(1_000_000)
+    st.session_state.rng  = random.Random(st.session_state.seed)
+
 for k, v in [("clue_history", []), ("history_pos", -1)]:
     if k not in st.session_state:
         st.session_state[k] = v
@@ -536,29 +453,50 @@ DIFFICULTY_RANGES = {
     "Final Jeopardy":       None,          # special: filter by round == 3
 }
 
+def _season_numbers():
+    """Season number of every row (unnumbered seasons last), for either backend."""
+    last    = np.iinfo(np.int32).max
+    seasons = df['season']
+    if isinstance(seasons, np.ndarray):   # ClueStore: int16, -1 = unnumbered
+        return np.where(seasons < 0, last, seasons.astype(np.int32))
+    if not isinstance(seasons.dtype, pd.CategoricalDtype):
+        seasons = seasons.astype("category")
+    numbers = np.array([int(s) if str(s).isdigit() else last for s in seasons.cat.categories]
+                       + [last], dtype=np.int64)   # code -1 (missing) → last
+    return numbers[seasons.cat.codes.to_numpy()]
+
 def get_filtered_pool():
+    """Positional indexes of the clues matching the difficulty filter, in
+    canonical (season, row) order. A progressive load keeps its first season
+    ahead of the rest, so plain position order would make a ?seed=N replay
+    draw different clues than a fresh-cache load of the same corpus.
+    Works on plain value/round/season columns so both corpus backends share it."""
     if df is None:
         return None
-    diff = st.session_state.settings["difficulty"]
+    diff   = st.session_state.settings["difficulty"]
+    values = np.asarray(df['clue_value'])
     if diff == "Final Jeopardy":
-        pool = df[df.get('round', pd.Series(dtype=int)) == 3] if 'round' in df.columns else df[df['clue_value'].apply(lambda v: int(v or 0) == 0)]
+        mask = np.asarray(df['round']) == 3 if 'round' in df.columns else values == 0
     else:
         lo, hi = DIFFICULTY_RANGES[diff]
-        pool = df[df['clue_value'].apply(lambda v: lo <= int(v or 0) <= hi)]
-    return pool if len(pool) > 0 else df
+        mask = (values >= lo) & (values <= hi)
+    pool = np.flatnonzero(mask)
+    if len(pool) == 0:
+        pool = np.arange(len(df))
+    return pool[np.argsort(_season_numbers()[pool], kind="stable")]
 
 import time
 
 def get_next():
     pool = get_filtered_pool()
     if pool is not None:
-        st.session_state.idx = pool.sample(1).index[0]
+        st.session_state.idx = int(st.session_state.rng.choice(pool))
         st.session_state.show = False
         st.session_state.user_answer = ""
         st.session_state.match_result = None
         st.session_state.timed_out = False
         st.session_state.clue_start_time = time.time()
-        row = df.iloc[st.session_state.idx]
+        row = _clue_row(st.session_state.idx)
         st.session_state.current_tag = get_tag_for_clue(row)
         st.session_state.history_pos = -1   # back at frontier
         st.session_state.initialized = True
@@ -670,14 +608,14 @@ with tab_game:
         at_frontier = (hist_pos == -1)
 
         if at_frontier:
-            clue      = df.iloc[st.session_state.idx]
+            clue      = _clue_row(st.session_state.idx)
             u_cat     = st.session_state.current_tag
         else:
             entry     = hist[hist_pos]
-            clue      = df.iloc[entry["df_idx"]]
+            clue      = _clue_row(entry["df_idx"])
             u_cat     = entry["tag"]
 
-        _raw_value         = int(clue.get('clue_value') or 0)
+        _raw_value         = int(clue['clue_value'])   # cleaned to int at ingest
         clue_value         = _raw_value if _raw_value > 0 else 0
         clue_value_display = "Final Jeopardy" if _raw_value == 0 else f"${_raw_value}"
         close_enough_on    = st.session_state.settings["close_enough"]
@@ -752,6 +690,10 @@ with tab_game:
         st.markdown(f'<div class="category-box"><div class="category-text">{clue["category"]}</div></div>', unsafe_allow_html=True)
         st.markdown(f"### {clue['answer']}")
         st.caption(f"Season {clue['season']} | {clue_value_display}")
+        if MASK_COLUMNS[0] in clue:   # multi-label masks stored (TRIVIA_TAG_MASKS=1)
+            also = [t for t in tags_in_mask(clue) if t not in (u_cat, "Other")]
+            if also:
+                st.caption("Also touches: " + ", ".join(also))
 
         # ── TAG SELECTOR ──────────────────────────────────────────────────────
         sorted_tags  = sorted([t for t in ALL_TAGS if t != "Other"]) + ["Other"]
@@ -928,6 +870,13 @@ col_a, col_b = st.sidebar.columns(2)
 col_a.metric("Total Correct", f"{total_correct} / {total_seen}")
 winnings = st.session_state.get('winnings', 0)
 col_b.metric("Winnings", f"{'$' if winnings >= 0 else '-$'}{abs(winnings):,}")
+if corpus_loader is not None and not corpus_loader.ready.is_set() and df is not None:
+    st.sidebar.caption(f"⏳ Loading remaining seasons… {len(df):,} clues ready so far.")
+for _warning in CORPUS_WARNINGS:
+    st.sidebar.warning(_warning)
+if corpus_loader is not None and corpus_loader.error is not None:
+    st.sidebar.error(f"Loading the remaining seasons failed ({corpus_loader.error}); "
+                     f"{len(df) if df is not None else 0:,} clues available. Retrying on the next action.")
 
 # ── SETTINGS ──────────────────────────────────────────────────────────────
 st.sidebar.divider()
@@ -948,6 +897,43 @@ if diff_choice != st.session_state.settings["difficulty"]:
 if st.session_state.settings["difficulty"] == "Final Jeopardy":
     st.sidebar.caption("🎯 These are single, high-stakes clues — one per episode. Great for simulating pressure situations.")
 
+# Corpus subset — only the selected seasons/rounds are loaded and held in memory.
+# The selection changes only when a widget does (on_change), so a first render
+# never overwrites a TRIVIA_SEASONS / TRIVIA_ROUNDS default it cannot show
+# exactly (e.g. "30,41" on a range slider).
+def _on_corpus_seasons():
+    s_lo, s_hi = st.session_state.corpus_seasons
+    seasons = tuple(s for s in _available if s_lo <= s <= s_hi)
+    st.session_state.corpus_selection = (None if seasons == tuple(_available) else seasons,
+                                         st.session_state.corpus_selection[1])
+    _reset_corpus_position()
+
+def _on_corpus_rounds():
+    r_pick = st.session_state.corpus_rounds
+    rounds = None if not r_pick or set(r_pick) == set(ROUND_NAMES) else tuple(sorted(r_pick))
+    st.session_state.corpus_selection = (st.session_state.corpus_selection[0], rounds)
+    _reset_corpus_position()
+
+if len(_available) > 1:
+    with st.sidebar.expander("📚 Corpus"):
+        _cur_s, _cur_r = st.session_state.corpus_selection
+        st.slider(
+            "Seasons",
+            min_value=_available[0], max_value=_available[-1],
+            value=(min(_cur_s), max(_cur_s)) if _cur_s else (_available[0], _available[-1]),
+            key="corpus_seasons", on_change=_on_corpus_seasons,
+        )
+        st.multiselect(
+            "Rounds",
+            options=list(ROUND_NAMES),
+            default=list(_cur_r or ROUND_NAMES),
+            format_func=ROUND_NAMES.get,
+            key="corpus_rounds", on_change=_on_corpus_rounds,
+        )
+        if _cur_s and len(_cur_s) != max(_cur_s) - min(_cur_s) + 1:
+            st.caption(f"Seasons {', '.join(map(str, _cur_s))}")
+        st.caption(f"{len(df) if df is not None else 0:,} clues loaded")
+
 st.sidebar.divider()
 
 # Close enough mode toggle
@@ -1026,6 +1012,59 @@ if st.sidebar.button("🔄 REFRESH ALL STATS", use_container_width=True):
     st.session_state.winnings = 0
     _save_game_stats(st.session_state.stats, 0)
     st.rerun()
+st.sidebar.caption(f"Session seed: {st.session_state.seed} — open with ?seed={st.session_state.seed} to replay.")
+
+# ── TAG RULE PROFILE (debug: open the app with ?debug=1) ──────────────────
+if st.query_params.get("debug") == "1":
+    with st.sidebar.expander("🛠 Tag rule profile"):
+        if df is None or isinstance(df, ClueStore):
+            st.caption("Profiling needs the pandas corpus backend.")
+        elif st.button("Profile tagging of the loaded corpus", use_container_width=True):
+            st.session_state.tag_profile = profile_corpus(df)
+        if st.session_state.get("tag_profile"):
+            # column headers sort the table; default order is total time
+            st.dataframe(pd.DataFrame(st.session_state.tag_profile), hide_index=True)
+
+@st.cache_resource(max_entries=1)
+def load_rule_playground(_df, rows, seasons=None, rounds=None, tag_rules=None):
+    """Trigram index + current tags over the loaded corpus (tag_playground.py).
+    _df is not hashed; its size, the selection and the rules key the cache."""
+    return RulePlayground(_df)
+
+# ── TAG RULE PLAYGROUND (debug) ───────────────────────────────────────────
+if st.query_params.get("debug") == "1":
+    with st.sidebar.expander("🧪 Tag rule playground"):
+        if df is None or isinstance(df, ClueStore):
+            st.caption("The playground needs the pandas corpus backend.")
+        else:
+            pg_pattern = st.text_input("Draft regex", placeholder=r"\bopera\b|libretto")
+            pg_pass    = st.radio("Pass", PASS_NAMES, horizontal=True)
+            pg_label   = st.text_input("Label", value="Draft")
+            pg_rules   = TAXONOMY.category_map if pg_pass == "category" else TAXONOMY.content_map
+            pg_before  = st.selectbox("Insert before", ["(last)"] + list(pg_rules))
+            if st.button("Test rule", use_container_width=True, disabled=not pg_pattern):
+                lab = load_rule_playground(df, len(df), _sel_seasons, _sel_rounds, TAXONOMY.fingerprint)
+                try:
+                    st.session_state.rule_test = lab.test(
+                        pg_pattern, pg_pass, pg_label, None if pg_before == "(last)" else pg_before)
+                except (re.error, ValueError) as e:
+                    st.session_state.rule_test = {"error": str(e)}
+            result = st.session_state.get("rule_test")
+            if result and "error" in result:
+                st.error(result["error"])
+            elif result:
+                st.caption(f"{result['matches']:,} clues match · {result['moved']:,} would change tag · "
+                           f"{result['candidates']:,} of {result['clues']:,} checked "
+                           f"in {result['seconds'] * 1000:.0f} ms")
+                for problem in result["problems"]:
+                    st.warning(problem)
+                if result["moves"]:
+                    st.dataframe(pd.DataFrame(
+                        [{"from": old, "to": new, "clues": n}
+                         for (old, new), n in sorted(result["moves"].items(), key=lambda kv: -kv[1])]),
+                        hide_index=True)
+                if result["samples"]:
+                    st.dataframe(pd.DataFrame(result["samples"]), hide_index=True)
 
 with tab_drill:
     render_drill_mode()